@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from operator import itemgetter
+from typing import Any
+from uuid import UUID
+
+from complexheart.domain.criteria import Criteria, Cursor, Filter, FilterGroup, Operator
+
+FINGERPRINT_SIZE = 16
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, set | frozenset):
+        return {"$set": sorted(_dumps(v) for v in value)}
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, time):
+        return {"$time": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, UUID):
+        return {"$uuid": str(value)}
+    if isinstance(value, bytes | bytearray):
+        return {"$bytes": value.hex()}
+    if isinstance(value, Enum):
+        return {"$enum": f"{type(value).__qualname__}.{value.name}"}
+    raise TypeError(f"Cannot encode value of type {type(value).__name__} canonically")
+
+
+def _tag(value: Any) -> Any:
+    # JSON writes tuples and lists as the same array and turns every dict key into a string,
+    # so tuples are tagged and dicts become [key, value] pairs sorted by their encoded key.
+    if isinstance(value, tuple):
+        return {"$tuple": [_tag(v) for v in value]}
+    if isinstance(value, list):
+        return [_tag(v) for v in value]
+    if isinstance(value, dict):
+        pairs = sorted(((_dumps(k), k, v) for k, v in value.items()), key=itemgetter(0))
+        return {"$dict": [[_tag(k), _tag(v)] for _, k, v in pairs]}
+    return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(_tag(value), default=_encode_value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _filter(f: Filter) -> list[Any]:
+    return [f.field, f.operator.name, f.value]
+
+
+def _group(group: FilterGroup) -> list[list[Any]]:
+    return [_filter(f) for f in group]
+
+
+def _sorted_unique(items: Iterable[Any], key: Callable[[Any], str]) -> tuple[Any, ...]:
+    keyed = {key(item): item for item in items}
+    return tuple(keyed[k] for k in sorted(keyed))
+
+
+def canonical_filter(f: Filter) -> Filter:
+    if f.operator in (Operator.IN, Operator.NOT_IN) and isinstance(f.value, Iterable) and not isinstance(f.value, str):
+        return Filter.unchecked(f.field, f.operator, _sorted_unique(f.value, _dumps))
+    return f
+
+
+def canonical_group(group: FilterGroup) -> FilterGroup:
+    return FilterGroup(_sorted_unique((canonical_filter(f) for f in group), lambda f: _dumps(_filter(f))))
+
+
+def canonicalize(criteria: Criteria) -> Criteria:
+    groups = _sorted_unique((canonical_group(g) for g in criteria.groups if g), lambda g: _dumps(_group(g)))
+    return Criteria(groups, criteria.order, criteria.page)
+
+
+def encode(criteria: Criteria) -> str:
+    page = criteria.page
+    return _dumps(
+        {
+            "groups": [_group(g) for g in criteria.groups if g],
+            "order": [list(criteria.order.by), criteria.order.type.name] if criteria.has_order() else None,
+            "page": {"limit": page.limit, "after": list(page.after)}
+            if isinstance(page, Cursor)
+            else {"limit": page.limit, "offset": page.offset},
+        }
+    )
+
+
+def fingerprint(criteria: Criteria) -> str:
+    return hashlib.blake2b(encode(canonicalize(criteria)).encode(), digest_size=FINGERPRINT_SIZE).hexdigest()
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
-from collections.abc import Iterator, Sequence
+import base64
+import dataclasses
+import json
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
+from datetime import date, datetime
 from enum import Enum, unique
-from typing import Any, overload
+from typing import TYPE_CHECKING, Any, overload
+
+if TYPE_CHECKING:
+    from complexheart.domain.evaluation import Predicate
+    from complexheart.domain.template import Template
 
 
 @unique
@@ -25,11 +33,25 @@ class Operator(Enum):
         return self.value
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class Param:
+    name: str
+
+    def __post_init__(self) -> None:
+        if not self.name or not self.name.isidentifier():
+            raise ValueError(f"Param name must be an identifier, got {self.name!r}")
+
+    def __str__(self) -> str:
+        return f":{self.name}"
+
+
+@dataclass(frozen=True, slots=True)
 class Filter:
     field: str
     operator: Operator
     value: Any
+    # The `field` attribute shadows dataclasses.field inside this class body.
+    _hash: int | None = dataclasses.field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if not self.field or not self.field.strip():
@@ -45,16 +67,33 @@ class Filter:
         raise TypeError(f"unsupported operand type(s) for +: 'Filter' and '{type(other).__name__}'")
 
     def __hash__(self) -> int:
-        try:
-            return hash((self.field, self.operator, self.value))
-        except TypeError:
-            return hash((self.field, self.operator, str(self.value)))
+        if self._hash is None:
+            try:
+                value = hash((self.field, self.operator, self.value))
+            except TypeError:
+                value = hash((self.field, self.operator, str(self.value)))
+            object.__setattr__(self, "_hash", value)
+        return self._hash  # type: ignore[return-value]
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Filter):
             return NotImplemented
         return self.field == other.field and self.operator == other.operator and self.value == other.value
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        return Filter.unchecked, (self.field, self.operator, self.value)
+
+    @staticmethod
+    def unchecked(field: str, operator: Operator, value: Any) -> Filter:
+        f = object.__new__(Filter)
+        object.__setattr__(f, "field", field)
+        object.__setattr__(f, "operator", operator)
+        object.__setattr__(f, "value", value)
+        object.__setattr__(f, "_hash", None)
+        return f
+
     def __repr__(self) -> str:
         return f"Filter({self.field!r}, {self.operator.name}, {self.value!r})"
 
@@ -110,34 +149,38 @@ class Filter:
         return f"{self.field} {self.operator} {self.value}"
 
 
+_OPERATORS = {
+    "==": Operator.EQUAL,
+    "=": Operator.EQUAL,
+    "!=": Operator.NOT_EQUAL,
+    "<>": Operator.NOT_EQUAL,
+    ">": Operator.GT,
+    ">=": Operator.GTE,
+    "<": Operator.LT,
+    "<=": Operator.LTE,
+    "in": Operator.IN,
+    "not in": Operator.NOT_IN,
+    "like": Operator.LIKE,
+    "not like": Operator.NOT_LIKE,
+    "contains": Operator.CONTAINS,
+    "not contains": Operator.NOT_CONTAINS,
+}
+
+
 def _str_to_operator(op: str) -> Operator:
-    mapping = {
-        "==": Operator.EQUAL,
-        "=": Operator.EQUAL,
-        "!=": Operator.NOT_EQUAL,
-        "<>": Operator.NOT_EQUAL,
-        ">": Operator.GT,
-        ">=": Operator.GTE,
-        "<": Operator.LT,
-        "<=": Operator.LTE,
-        "in": Operator.IN,
-        "not in": Operator.NOT_IN,
-        "like": Operator.LIKE,
-        "not like": Operator.NOT_LIKE,
-        "contains": Operator.CONTAINS,
-        "not contains": Operator.NOT_CONTAINS,
-    }
+    operator = _OPERATORS.get(op)
+    if operator is not None:
+        return operator
     normalized = op.lower().strip()
-    if normalized in mapping:
-        return mapping[normalized]
-    if op in mapping:
-        return mapping[op]
+    if normalized in _OPERATORS:
+        return _OPERATORS[normalized]
     raise ValueError(f"Unknown operator: {op}")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FilterGroup:
     _filters: tuple[Filter, ...] = field(default_factory=tuple)
+    _hash: int | None = field(default=None, init=False, repr=False, compare=False)
 
     def __len__(self) -> int:
         return len(self._filters)
@@ -175,13 +218,20 @@ class FilterGroup:
         raise TypeError(f"unsupported operand type(s) for +: '{type(other).__name__}' and 'FilterGroup'")
 
     def __hash__(self) -> int:
-        return hash(self._filters)
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(self._filters))
+        return self._hash  # type: ignore[return-value]
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, FilterGroup):
             return NotImplemented
         return self._filters == other._filters
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        return FilterGroup, (self._filters,)
+
     def __repr__(self) -> str:
         if not self._filters:
             return "FilterGroup()"
@@ -255,7 +305,7 @@ class OrderType(Enum):
         return self.value
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Order:
     by: tuple[str, ...] = field(default_factory=tuple)
     type: OrderType = OrderType.ASC
@@ -281,7 +331,7 @@ class Order:
         return f"{', '.join(self.by)} {self.type}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Page:
     limit: int = 25
     offset: int = 0
@@ -296,11 +346,69 @@ class Page:
         return f"{self.limit}, {self.offset}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class Cursor:
+    limit: int = 25
+    after: tuple[Any, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.limit < 0:
+            raise ValueError(f"limit must be >= 0, got {self.limit}")
+        if not isinstance(self.after, tuple):
+            object.__setattr__(self, "after", tuple(self.after))
+
+    @property
+    def offset(self) -> int:
+        return 0
+
+    @property
+    def token(self) -> str:
+        payload = json.dumps(list(self.after), default=_encode_cursor_value, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def from_token(token: str, limit: int = 25) -> Cursor:
+        try:
+            payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            values = json.loads(payload, object_hook=_decode_cursor_value)
+        except ValueError as e:
+            raise ValueError(f"Invalid cursor token: {token!r}") from e
+        if not isinstance(values, list):
+            raise ValueError(f"Invalid cursor token: {token!r}")
+        return Cursor(limit, tuple(values))
+
+    @staticmethod
+    def first(limit: int = 25) -> Cursor:
+        return Cursor(limit)
+
+    def __str__(self) -> str:
+        return f"{self.limit}, after {self.after}"
+
+
+def _encode_cursor_value(value: Any) -> dict[str, str]:
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Cursor values must be JSON serializable, dates or datetimes, got {type(value).__name__}")
+
+
+def _decode_cursor_value(value: dict[str, Any]) -> Any:
+    if "$datetime" in value:
+        return datetime.fromisoformat(value["$datetime"])
+    if "$date" in value:
+        return date.fromisoformat(value["$date"])
+    return value
+
+
+@dataclass(frozen=True, slots=True)
 class Criteria:
     _groups: tuple[FilterGroup, ...] = field(default_factory=tuple)
     order: Order = field(default_factory=Order.none)
-    page: Page = field(default_factory=Page)
+    page: Page | Cursor = field(default_factory=Page)
+    _predicate: Predicate | None = field(default=None, init=False, repr=False, compare=False)
+    _fingerprint: str | None = field(default=None, init=False, repr=False, compare=False)
+    _hash: int | None = field(default=None, init=False, repr=False, compare=False)
 
     def __or__(self, other: Criteria) -> Criteria:
         if not isinstance(other, Criteria):
@@ -326,38 +434,96 @@ class Criteria:
         return Criteria((FilterGroup(tuple(all_filters)),), self.order, self.page)
 
     def __hash__(self) -> int:
-        return hash((self._groups, self.order, self.page))
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash((self._groups, self.order, self.page)))
+        return self._hash  # type: ignore[return-value]
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Criteria):
             return NotImplemented
         return self._groups == other._groups and self.order == other.order and self.page == other.page
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        return Criteria, (self._groups, self.order, self.page)
+
     def __repr__(self) -> str:
         parts = [f"groups={len(self._groups)}"]
         if self.has_filters():
             parts.append(f"filters={len(self.filters)}")
         if self.has_order():
             parts.append(f"order={self.order.by}")
-        if self.page != Page():
+        if isinstance(self.page, Cursor):
+            parts.append(f"cursor=({self.page.limit}, {self.page.after!r})")
+        elif self.page != Page():
             parts.append(f"page=({self.page.limit}, {self.page.offset})")
         return f"Criteria({', '.join(parts)})"
 
+    @staticmethod
+    def builder() -> CriteriaBuilder:
+        return CriteriaBuilder()
+
+    def to_builder(self) -> CriteriaBuilder:
+        return CriteriaBuilder(self)
+
     def with_filter_group(self, group: FilterGroup) -> Criteria:
         return Criteria((*self._groups, group), self.order, self.page)
 
     def with_order(self, order: Order) -> Criteria:
         return Criteria(self._groups, order, self.page)
 
-    def with_page(self, page: Page) -> Criteria:
+    def with_page(self, page: Page | Cursor) -> Criteria:
         return Criteria(self._groups, self.order, page)
 
     def with_page_limit(self, limit: int) -> Criteria:
+        if isinstance(self.page, Cursor):
+            return Criteria(self._groups, self.order, Cursor(limit, self.page.after))
         return Criteria(self._groups, self.order, Page(limit, self.page.offset))
 
     def with_page_offset(self, offset: int) -> Criteria:
+        if isinstance(self.page, Cursor):
+            raise ValueError("offset cannot be combined with a cursor page")
         return Criteria(self._groups, self.order, Page(self.page.limit, offset))
 
+    def with_cursor(self, cursor: Cursor) -> Criteria:
+        return Criteria(self._groups, self.order, cursor)
+
+    def cursor_after(self, record: Any) -> Cursor:
+        from complexheart.domain.evaluation import field_getter
+
+        if not self.has_order():
+            raise ValueError("Cursor pagination requires an order")
+        return Cursor(self.page.limit, tuple(field_getter(f)(record) for f in self.order.by))
+
+    def seek(self) -> Criteria:
+        if not isinstance(self.page, Cursor):
+            return self
+        page = Page(self.page.limit, 0)
+        after = self.page.after
+        if not after:
+            return Criteria(self._groups, self.order, page)
+        if not self.has_order():
+            raise ValueError("Cursor pagination requires an order")
+        by = self.order.by
+        if len(after) != len(by):
+            raise ValueError(f"Cursor has {len(after)} values but order has {len(by)} fields")
+        descending = self.order.type == OrderType.DESC
+        seek_groups: list[tuple[Filter, ...]] = []
+        for i in range(len(by)):
+            prefix = tuple(Filter.unchecked(f, Operator.EQUAL, v) for f, v in zip(by[:i], after[:i], strict=True))
+            # None sorts first, so it precedes every value ascending and follows every value descending.
+            if descending:
+                seek_groups.append((*prefix, Filter.unchecked(by[i], Operator.LT, after[i])))
+                if after[i] is not None:
+                    seek_groups.append((*prefix, Filter.unchecked(by[i], Operator.EQUAL, None)))
+            elif after[i] is None:
+                seek_groups.append((*prefix, Filter.unchecked(by[i], Operator.NOT_EQUAL, None)))
+            else:
+                seek_groups.append((*prefix, Filter.unchecked(by[i], Operator.GT, after[i])))
+        groups = [g._filters for g in self._groups if g] or [()]
+        return Criteria(tuple(FilterGroup(g + s) for g in groups for s in seek_groups), self.order, page)
+
     def filter(self, field: str, operator: str, value: Any, group: int = 0) -> Criteria:
         new_filter = Filter(field, _str_to_operator(operator), value)
 
@@ -398,6 +564,40 @@ class Criteria:
     def has_order(self) -> bool:
         return self.order.type != OrderType.NONE and len(self.order.by) > 0
 
+    def compile(self) -> Predicate:
+        if self._predicate is None:
+            from complexheart.domain.evaluation import compile_criteria
+
+            object.__setattr__(self, "_predicate", compile_criteria(self))
+        return self._predicate  # type: ignore[return-value]
+
+    def template(self) -> Template:
+        from complexheart.domain.template import Template
+
+        return Template(self)
+
+    def canonical(self) -> Criteria:
+        from complexheart.domain.canonical import canonicalize
+
+        return canonicalize(self)
+
+    def fingerprint(self) -> str:
+        if self._fingerprint is None:
+            from complexheart.domain.canonical import fingerprint
+
+            object.__setattr__(self, "_fingerprint", fingerprint(self))
+        return self._fingerprint  # type: ignore[return-value]
+
+    def normalize(self) -> Criteria:
+        from complexheart.domain.normalization import normalize
+
+        return normalize(self)
+
+    def stream(self, records: Iterable[Any]) -> Iterator[Any]:
+        from complexheart.domain.evaluation import stream
+
+        return stream(self, records)
+
     def __str__(self) -> str:
         parts = []
 
@@ -408,7 +608,99 @@ class Criteria:
         if self.has_order():
             parts.append(f"ORDER BY {self.order}")
 
-        if self.page != Page():
+        if isinstance(self.page, Cursor):
+            parts.append(f"LIMIT {self.page.limit}" + (f" AFTER {self.page.after}" if self.page.after else ""))
+        elif self.page != Page():
             parts.append(f"LIMIT {self.page.limit} OFFSET {self.page.offset}")
 
         return " ".join(parts)
+
+
+class CriteriaBuilder:
+    def __init__(self, criteria: Criteria | None = None) -> None:
+        criteria = criteria if criteria is not None else Criteria()
+        self._groups: list[list[Filter]] = [list(g._filters) for g in criteria.groups]
+        self._order = criteria.order
+        self._page = criteria.page
+
+    def __len__(self) -> int:
+        return sum(len(g) for g in self._groups)
+
+    def build(self) -> Criteria:
+        return Criteria(tuple(FilterGroup(tuple(g)) for g in self._groups), self._order, self._page)
+
+    def add_filter(self, f: Filter, group: int = 0) -> CriteriaBuilder:
+        while len(self._groups) <= group:
+            self._groups.append([])
+        self._groups[group].append(f)
+        return self
+
+    def with_filter_group(self, group: FilterGroup) -> CriteriaBuilder:
+        self._groups.append(list(group._filters))
+        return self
+
+    def filter(self, field: str, operator: str, value: Any, group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter(field, _str_to_operator(operator), value), group)
+
+    def add_filter_equal(self, field: str, value: Any, group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.equal(field, value), group)
+
+    def add_filter_not_equal(self, field: str, value: Any, group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.not_equal(field, value), group)
+
+    def add_filter_greater_than(self, field: str, value: Any, group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.greater_than(field, value), group)
+
+    def add_filter_greater_or_equal_than(self, field: str, value: Any, group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.greater_or_equal_than(field, value), group)
+
+    def add_filter_less_than(self, field: str, value: Any, group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.less_than(field, value), group)
+
+    def add_filter_less_or_equal_than(self, field: str, value: Any, group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.less_or_equal_than(field, value), group)
+
+    def add_filter_in(self, field: str, value: Sequence[Any], group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.in_(field, value), group)
+
+    def add_filter_not_in(self, field: str, value: Sequence[Any], group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.not_in(field, value), group)
+
+    def add_filter_like(self, field: str, value: Any, group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.like(field, value), group)
+
+    def add_filter_not_like(self, field: str, value: Any, group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.not_like(field, value), group)
+
+    def add_filter_contains(self, field: str, value: Any, group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.contains(field, value), group)
+
+    def add_filter_not_contains(self, field: str, value: Any, group: int = 0) -> CriteriaBuilder:
+        return self.add_filter(Filter.not_contains(field, value), group)
+
+    def with_order(self, order: Order) -> CriteriaBuilder:
+        self._order = order
+        return self
+
+    def order_by(self, by: tuple[str, ...], order: OrderType | str = OrderType.ASC) -> CriteriaBuilder:
+        if not isinstance(order, OrderType):
+            order = OrderType(order.upper())
+        self._order = Order(by, order)
+        return self
+
+    def with_page(self, page: Page | Cursor) -> CriteriaBuilder:
+        self._page = page
+        return self
+
+    def limit(self, limit: int) -> CriteriaBuilder:
+        if isinstance(self._page, Cursor):
+            self._page = Cursor(limit, self._page.after)
+        else:
+            self._page = Page(limit, self._page.offset)
+        return self
+
+    def offset(self, offset: int) -> CriteriaBuilder:
+        if isinstance(self._page, Cursor):
+            raise ValueError("offset cannot be combined with a cursor page")
+        self._page = Page(self._page.limit, offset)
+        return self
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import heapq
+import operator
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from complexheart.domain.criteria import Filter, FilterGroup, Operator, Order, OrderType
+
+if TYPE_CHECKING:
+    from complexheart.domain.criteria import Criteria
+
+Predicate = Callable[[Any], bool]
+Getter = Callable[[Any], Any]
+
+
+def field_getter(field: str) -> Getter:
+    def get(record: Any) -> Any:
+        if type(record) is dict or isinstance(record, Mapping):
+            return record.get(field)
+        return getattr(record, field, None)
+
+    return get
+
+
+def like_to_regex(pattern: str) -> re.Pattern[str]:
+    parts = []
+    for char in pattern:
+        if char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts), re.DOTALL)
+
+
+@lru_cache(maxsize=1024)
+def compile_like(pattern: str) -> Callable[[str], bool]:
+    if "_" not in pattern:
+        literal = pattern.strip("%")
+        if "%" not in literal:
+            if not literal and "%" in pattern:
+                return _is_any_string
+            leading, trailing = pattern.startswith("%"), pattern.endswith("%")
+            if leading and trailing:
+                return lambda value: literal in value
+            if trailing:
+                return lambda value: value.startswith(literal)
+            if leading:
+                return lambda value: value.endswith(literal)
+            return lambda value: value == literal
+    regex = like_to_regex(pattern)
+    return lambda value: regex.fullmatch(value) is not None
+
+
+def _is_any_string(value: str) -> bool:
+    return True
+
+
+def as_collection(value: Any) -> frozenset[Any] | tuple[Any, ...]:
+    if isinstance(value, str) or not isinstance(value, Iterable):
+        value = (value,)
+    items = tuple(value)
+    try:
+        return frozenset(items)
+    except TypeError:
+        return items
+
+
+def _compile_equal(get: Getter, expected: Any) -> Predicate:
+    return lambda record: get(record) == expected
+
+
+def _compile_not_equal(get: Getter, expected: Any) -> Predicate:
+    return lambda record: get(record) != expected
+
+
+def _compile_comparison(compare: Callable[[Any, Any], bool]) -> Callable[[Getter, Any], Predicate]:
+    def factory(get: Getter, expected: Any) -> Predicate:
+        def check(record: Any) -> bool:
+            try:
+                return compare(get(record), expected)
+            except TypeError:
+                return False
+
+        return check
+
+    return factory
+
+
+def _compile_in(get: Getter, expected: Any) -> Predicate:
+    members = as_collection(expected)
+
+    def check(record: Any) -> bool:
+        try:
+            return get(record) in members
+        except TypeError:
+            return False
+
+    return check
+
+
+def _compile_not_in(get: Getter, expected: Any) -> Predicate:
+    is_member = _compile_in(get, expected)
+    return lambda record: not is_member(record)
+
+
+def _compile_like(get: Getter, expected: Any) -> Predicate:
+    matches = compile_like(str(expected))
+
+    def check(record: Any) -> bool:
+        actual = get(record)
+        return isinstance(actual, str) and matches(actual)
+
+    return check
+
+
+def _compile_not_like(get: Getter, expected: Any) -> Predicate:
+    matches = compile_like(str(expected))
+
+    def check(record: Any) -> bool:
+        actual = get(record)
+        return isinstance(actual, str) and not matches(actual)
+
+    return check
+
+
+def _compile_contains(get: Getter, expected: Any) -> Predicate:
+    def check(record: Any) -> bool:
+        try:
+            return expected in get(record)
+        except TypeError:
+            return False
+
+    return check
+
+
+def _compile_not_contains(get: Getter, expected: Any) -> Predicate:
+    contains = _compile_contains(get, expected)
+    return lambda record: not contains(record)
+
+
+_COMPILERS: dict[Operator, Callable[[Getter, Any], Predicate]] = {
+    Operator.EQUAL: _compile_equal,
+    Operator.NOT_EQUAL: _compile_not_equal,
+    Operator.GT: _compile_comparison(operator.gt),
+    Operator.GTE: _compile_comparison(operator.ge),
+    Operator.LT: _compile_comparison(operator.lt),
+    Operator.LTE: _compile_comparison(operator.le),
+    Operator.IN: _compile_in,
+    Operator.NOT_IN: _compile_not_in,
+    Operator.LIKE: _compile_like,
+    Operator.NOT_LIKE: _compile_not_like,
+    Operator.CONTAINS: _compile_contains,
+    Operator.NOT_CONTAINS: _compile_not_contains,
+}
+
+
+def _match_all(record: Any) -> bool:
+    return True
+
+
+def _all_of(checks: Sequence[Predicate]) -> Predicate:
+    if len(checks) == 1:
+        return checks[0]
+    if len(checks) == 2:
+        first, second = checks
+        return lambda record: first(record) and second(record)
+
+    def check(record: Any) -> bool:
+        for c in checks:  # noqa: SIM110 - avoids the generator overhead of all()
+            if not c(record):
+                return False
+        return True
+
+    return check
+
+
+def _any_of(checks: Sequence[Predicate]) -> Predicate:
+    if len(checks) == 1:
+        return checks[0]
+    if len(checks) == 2:
+        first, second = checks
+        return lambda record: first(record) or second(record)
+
+    def check(record: Any) -> bool:
+        for c in checks:  # noqa: SIM110 - avoids the generator overhead of any()
+            if c(record):
+                return True
+        return False
+
+    return check
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def compile_filter(f: Filter) -> Predicate:
+    return _COMPILERS[f.operator](field_getter(f.field), f.value)
+
+
+def compile_value_predicate(f: Filter) -> Predicate:
+    return _COMPILERS[f.operator](_identity, f.value)
+
+
+def compile_group(group: FilterGroup) -> Predicate:
+    if not group:
+        return _match_all
+    return _all_of([compile_filter(f) for f in group])
+
+
+def combine(groups: Sequence[Sequence[Predicate]]) -> Predicate:
+    groups = [g for g in groups if g]
+    if not groups:
+        return _match_all
+    return _any_of([_all_of(g) for g in groups])
+
+
+def compile_criteria(criteria: Criteria) -> Predicate:
+    groups = [g for g in criteria.groups if g]
+    if not groups:
+        return _match_all
+    return _any_of([compile_group(g) for g in groups])
+
+
+def sort_value(value: Any) -> tuple[bool, Any]:
+    return value is not None, value
+
+
+def sort_key(order: Order) -> Callable[[Any], tuple[tuple[bool, Any], ...]]:
+    getters = [field_getter(f) for f in order.by]
+    return lambda record: tuple(sort_value(get(record)) for get in getters)
+
+
+def is_ordered(order: Order) -> bool:
+    return order.type != OrderType.NONE and len(order.by) > 0
+
+
+def top(records: Iterable[Any], order: Order, limit: int, offset: int = 0) -> list[Any]:
+    if not is_ordered(order):
+        return list(islice(records, offset, offset + limit))
+    # A bounded heap of offset + limit entries; same result as a stable full sort then slicing, ties included.
+    select = heapq.nlargest if order.type == OrderType.DESC else heapq.nsmallest
+    return select(offset + limit, records, key=sort_key(order))[offset:]
+
+
+def stream(criteria: Criteria, records: Iterable[Any]) -> Iterator[Any]:
+    criteria = criteria.seek()
+    matches = filter(criteria.compile(), records)
+    page = criteria.page
+    if criteria.has_order():
+        yield from top(matches, criteria.order, page.limit, page.offset)
+    else:
+        yield from islice(matches, page.offset, page.offset + page.limit)
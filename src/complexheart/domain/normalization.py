@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from complexheart.domain.criteria import Criteria, Filter, FilterGroup, Operator
+from complexheart.domain.evaluation import as_collection
+
+RANGE_OPERATORS = (Operator.GT, Operator.GTE, Operator.LT, Operator.LTE)
+
+
+@dataclass(frozen=True)
+class Bound:
+    value: Any
+    inclusive: bool
+
+
+@dataclass(frozen=True)
+class Interval:
+    low: Bound | None = None
+    high: Bound | None = None
+
+    def tighten(self, f: Filter) -> Interval:
+        low, high = self.low, self.high
+        if f.operator in (Operator.EQUAL, Operator.GT, Operator.GTE):
+            candidate = Bound(f.value, f.operator != Operator.GT)
+            if low is None or candidate.value > low.value or (candidate.value == low.value and not candidate.inclusive):
+                low = candidate
+        if f.operator in (Operator.EQUAL, Operator.LT, Operator.LTE):
+            candidate = Bound(f.value, f.operator != Operator.LT)
+            if (
+                high is None
+                or candidate.value < high.value
+                or (candidate.value == high.value and not candidate.inclusive)
+            ):
+                high = candidate
+        return Interval(low, high)
+
+    def is_bounded(self) -> bool:
+        return self.low is not None or self.high is not None
+
+    def is_empty(self) -> bool:
+        if self.low is None or self.high is None:
+            return False
+        if self.low.value == self.high.value:
+            return not (self.low.inclusive and self.high.inclusive)
+        return bool(self.low.value > self.high.value)
+
+    def contains(self, value: Any) -> bool:
+        low, high = self.low, self.high
+        if low is not None and not (value >= low.value if low.inclusive else value > low.value):
+            return False
+        return high is None or bool(value <= high.value if high.inclusive else value < high.value)
+
+    def within(self, other: Interval) -> bool:
+        if other.low is not None:
+            if self.low is None or self.low.value < other.low.value:
+                return False
+            if self.low.value == other.low.value and self.low.inclusive and not other.low.inclusive:
+                return False
+        if other.high is not None:
+            if self.high is None or self.high.value > other.high.value:
+                return False
+            if self.high.value == other.high.value and self.high.inclusive and not other.high.inclusive:
+                return False
+        return True
+
+    def filters(self, name: str) -> list[Filter]:
+        low, high = self.low, self.high
+        if low is not None and high is not None and low.inclusive and high.inclusive and low.value == high.value:
+            return [Filter.unchecked(name, Operator.EQUAL, low.value)]
+        result = []
+        if low is not None:
+            result.append(Filter.unchecked(name, Operator.GTE if low.inclusive else Operator.GT, low.value))
+        if high is not None:
+            result.append(Filter.unchecked(name, Operator.LTE if high.inclusive else Operator.LT, high.value))
+        return result
+
+
+def _members(value: Any) -> list[Any]:
+    if isinstance(value, str) or not isinstance(value, Iterable):
+        return [value]
+    return _unique(list(value))
+
+
+def _unique(values: Sequence[Any]) -> list[Any]:
+    result: list[Any] = []
+    for v in values:
+        if v not in result:
+            result.append(v)
+    return result
+
+
+@dataclass
+class FieldConstraint:
+    name: str
+    values: list[Any] | None = None
+    interval: Interval = field(default_factory=Interval)
+    excluded: list[Any] = field(default_factory=list)
+    others: list[Filter] = field(default_factory=list)
+    sources: list[Filter] = field(default_factory=list)
+
+    @staticmethod
+    def from_filters(name: str, filters: Sequence[Filter]) -> FieldConstraint:
+        constraint = FieldConstraint(name)
+        for f in filters:
+            constraint.add(f)
+        return constraint
+
+    def add(self, f: Filter) -> None:
+        self.sources.append(f)
+        if f.operator == Operator.EQUAL:
+            self._allow([f.value])
+        elif f.operator == Operator.IN:
+            self._allow(_members(f.value))
+        elif f.operator in RANGE_OPERATORS and f.value is not None:
+            self.interval = self.interval.tighten(f)
+        elif f.operator == Operator.NOT_EQUAL:
+            self.excluded = _unique([*self.excluded, f.value])
+        elif f.operator == Operator.NOT_IN:
+            self.excluded = _unique([*self.excluded, *_members(f.value)])
+        elif f not in self.others:
+            self.others.append(f)
+
+    def _allow(self, values: list[Any]) -> None:
+        self.values = values if self.values is None else [v for v in self.values if v in values]
+
+    def allowed(self) -> list[Any] | None:
+        if self.values is None:
+            return None
+        return [v for v in self.values if v not in self.excluded and self.interval.contains(v)]
+
+    def is_empty(self) -> bool:
+        allowed = self.allowed()
+        return (allowed is not None and not allowed) or self.interval.is_empty()
+
+    def filters(self) -> list[Filter]:
+        allowed = self.allowed()
+        if allowed is not None:
+            if len(allowed) == 1:
+                return [Filter.unchecked(self.name, Operator.EQUAL, allowed[0]), *self.others]
+            return [Filter.unchecked(self.name, Operator.IN, tuple(allowed)), *self.others]
+        result = self.interval.filters(self.name)
+        excluded = [
+            v for v in self.excluded if v is None or not self.interval.is_bounded() or self.interval.contains(v)
+        ]
+        if len(excluded) == 1:
+            result.append(Filter.unchecked(self.name, Operator.NOT_EQUAL, excluded[0]))
+        elif excluded:
+            result.append(Filter.unchecked(self.name, Operator.NOT_IN, tuple(excluded)))
+        return result + self.others
+
+    def implies(self, f: Filter) -> bool:
+        if f in self.sources or f in self.others:
+            return True
+        allowed = self.allowed()
+        if f.operator == Operator.EQUAL:
+            return allowed is not None and len(allowed) == 1 and allowed[0] == f.value
+        if f.operator == Operator.IN:
+            members = as_collection(f.value)
+            return allowed is not None and all(v in members for v in allowed)
+        if f.operator in RANGE_OPERATORS and f.value is not None:
+            required = Interval().tighten(f)
+            if allowed is not None:
+                return all(required.contains(v) for v in allowed)
+            return self.interval.within(required)
+        if f.operator == Operator.NOT_EQUAL:
+            return self._excludes(f.value, allowed)
+        if f.operator == Operator.NOT_IN:
+            return all(self._excludes(v, allowed) for v in as_collection(f.value))
+        return False
+
+    def _excludes(self, value: Any, allowed: list[Any] | None) -> bool:
+        if allowed is not None:
+            return value not in allowed
+        if value in self.excluded:
+            return True
+        return value is not None and self.interval.is_bounded() and not self.interval.contains(value)
+
+
+def _constraints(group: FilterGroup) -> dict[str, FieldConstraint]:
+    constraints: dict[str, FieldConstraint] = {}
+    for f in group:
+        constraints.setdefault(f.field, FieldConstraint(f.field)).add(f)
+    return constraints
+
+
+def _by_field(group: FilterGroup) -> dict[str, list[Filter]]:
+    result: dict[str, list[Filter]] = {}
+    for f in group:
+        if f not in result.setdefault(f.field, []):
+            result[f.field].append(f)
+    return result
+
+
+def normalize_group(group: FilterGroup) -> FilterGroup | None:
+    filters: list[Filter] = []
+    for name, field_filters in _by_field(group).items():
+        try:
+            constraint = FieldConstraint.from_filters(name, field_filters)
+            if constraint.is_empty():
+                return None
+            filters.extend(constraint.filters())
+        except TypeError:
+            filters.extend(field_filters)
+    return FilterGroup(tuple(filters))
+
+
+def implies(group: FilterGroup, other: FilterGroup) -> bool:
+    try:
+        constraints = _constraints(group)
+        for f in other:
+            constraint = constraints.get(f.field)
+            if constraint is None or not constraint.implies(f):
+                return False
+    except TypeError:
+        return False
+    return True
+
+
+def normalize(criteria: Criteria) -> Criteria:
+    groups: list[FilterGroup] = []
+    for group in criteria.groups:
+        if not group:
+            continue
+        normalized = normalize_group(group)
+        if normalized is not None and normalized not in groups:
+            groups.append(normalized)
+    if not groups:
+        if not criteria.has_filters():
+            return Criteria((), criteria.order, criteria.page)
+        return Criteria(
+            (FilterGroup((Filter.unchecked(criteria.filters[0].field, Operator.IN, ()),)),),
+            criteria.order,
+            criteria.page,
+        )
+    kept = [
+        g
+        for i, g in enumerate(groups)
+        if not any(implies(g, other) and (j < i or not implies(other, g)) for j, other in enumerate(groups) if j != i)
+    ]
+    return Criteria(tuple(kept), criteria.order, criteria.page)
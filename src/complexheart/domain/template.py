@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Any
+
+from complexheart.domain.criteria import Criteria, Filter, FilterGroup, Param
+from complexheart.domain.evaluation import Predicate, combine, compile_filter
+
+
+class Template:
+    def __init__(self, criteria: Criteria) -> None:
+        self._criteria = criteria
+        self._slots: dict[int, list[tuple[int, str]]] = {}
+        self._checks: list[list[Predicate | None]] = []
+        for i, group in enumerate(criteria.groups):
+            checks: list[Predicate | None] = []
+            for j, f in enumerate(group):
+                if isinstance(f.value, Param):
+                    self._slots.setdefault(i, []).append((j, f.value.name))
+                    checks.append(None)
+                else:
+                    checks.append(compile_filter(f))
+            self._checks.append(checks)
+        self._params = frozenset(name for slots in self._slots.values() for _, name in slots)
+
+    @property
+    def criteria(self) -> Criteria:
+        return self._criteria
+
+    @property
+    def params(self) -> frozenset[str]:
+        return self._params
+
+    def bind(self, **values: Any) -> Criteria:
+        if values.keys() != self._params:
+            missing = sorted(self._params - values.keys())
+            unknown = sorted(values.keys() - self._params)
+            if missing:
+                raise ValueError(f"Missing template parameters: {', '.join(missing)}")
+            raise ValueError(f"Unknown template parameters: {', '.join(unknown)}")
+        groups = list(self._criteria.groups)
+        checks = list(self._checks)
+        for i, slots in self._slots.items():
+            filters = list(groups[i])
+            group_checks = list(checks[i])
+            for j, name in slots:
+                f = filters[j]
+                filters[j] = bound = Filter.unchecked(f.field, f.operator, values[name])
+                group_checks[j] = compile_filter(bound)
+            groups[i] = FilterGroup(tuple(filters))
+            checks[i] = group_checks
+        criteria = Criteria(tuple(groups), self._criteria.order, self._criteria.page)
+        object.__setattr__(criteria, "_predicate", combine(checks))  # type: ignore[arg-type]
+        return criteria
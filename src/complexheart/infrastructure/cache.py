@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from typing import Generic, Protocol, TypeVar
+
+from complexheart.domain.criteria import Criteria, Page
+from complexheart.domain.evaluation import top
+from complexheart.domain.normalization import implies
+
+T = TypeVar("T")
+
+
+class Repository(Protocol[T]):
+    def match(self, criteria: Criteria) -> list[T]: ...
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    derived: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.derived + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.hits + self.derived) / self.lookups if self.lookups else 0.0
+
+
+@dataclass(frozen=True)
+class CacheEntry(Generic[T]):
+    records: tuple[T, ...]
+    fields: frozenset[str]
+    expires_at: float | None
+    complete: bool = False
+    stale: frozenset[str] = frozenset()
+
+
+def criteria_fields(criteria: Criteria) -> frozenset[str]:
+    fields = {f.field for f in criteria.filters}
+    if criteria.has_order():
+        fields.update(criteria.order.by)
+    return frozenset(fields)
+
+
+def cache_key(criteria: Criteria) -> Criteria:
+    try:
+        return criteria.canonical()
+    except TypeError:
+        return criteria
+
+
+def is_complete(criteria: Criteria, records: list[T]) -> bool:
+    page = criteria.page
+    return isinstance(page, Page) and page.offset == 0 and len(records) < page.limit
+
+
+def subsumes(broader: Criteria, narrower: Criteria) -> bool:
+    broader_groups = [g for g in broader.groups if g]
+    if not broader_groups:
+        return True
+    narrower_groups = [g for g in narrower.groups if g]
+    if not narrower_groups:
+        return False
+    try:
+        return all(any(implies(group, other) for other in broader_groups) for group in narrower_groups)
+    except TypeError:
+        # A failed derivation check must only ever cost a trip to the backend.
+        return False
+
+
+class CachingRepository(Generic[T]):
+    def __init__(
+        self,
+        repository: Repository[T],
+        max_size: int = 1024,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        subsumption: bool = False,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError(f"Cache max_size must be positive, got {max_size}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"Cache ttl must be positive, got {ttl}")
+        self._repository = repository
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._subsumption = subsumption
+        self._entries: OrderedDict[Criteria, CacheEntry[T]] = OrderedDict()
+        self._by_field: dict[str, set[Criteria]] = {}
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, criteria: object) -> bool:
+        return isinstance(criteria, Criteria) and cache_key(criteria) in self._entries
+
+    @property
+    def repository(self) -> Repository[T]:
+        return self._repository
+
+    def match(self, criteria: Criteria) -> list[T]:
+        key = cache_key(criteria)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at is None or self._clock() < entry.expires_at:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return list(entry.records)
+            self._discard(key)
+            self.stats.expirations += 1
+        if self._subsumption:
+            records = self._derive(criteria)
+            if records is not None:
+                self.stats.derived += 1
+                self._store(key, records)
+                return records
+        self.stats.misses += 1
+        records = self._repository.match(criteria)
+        self._store(key, records)
+        return records
+
+    def invalidate(self, fields: Iterable[str]) -> int:
+        names = frozenset(fields)
+        stale: set[Criteria] = set()
+        for name in names:
+            stale.update(self._by_field.get(name, ()))
+        for criteria in stale:
+            self._discard(criteria)
+        # Surviving entries hold pre-write values of these fields, so they can no longer answer filters on them.
+        for criteria, entry in list(self._entries.items()):
+            if entry.complete:
+                self._entries[criteria] = replace(entry, stale=entry.stale | names)
+        self.stats.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        self.stats.invalidations += len(self._entries)
+        self._entries.clear()
+        self._by_field.clear()
+
+    def _derive(self, criteria: Criteria) -> list[T] | None:
+        # A complete broader result holds every record the narrower criteria can match, in backend order.
+        narrower = criteria.seek()
+        fields = criteria_fields(narrower)
+        now = self._clock()
+        for broader, entry in self._entries.items():
+            if not entry.complete or (entry.expires_at is not None and now >= entry.expires_at):
+                continue
+            if entry.stale & fields:
+                continue
+            if broader.has_order() and broader.order != narrower.order:
+                continue
+            if subsumes(broader, narrower):
+                self._entries.move_to_end(broader)
+                check = narrower.compile()
+                page = narrower.page
+                return top((r for r in entry.records if check(r)), narrower.order, page.limit, page.offset)
+        return None
+
+    def _store(self, criteria: Criteria, records: list[T]) -> None:
+        expires_at = None if self._ttl is None else self._clock() + self._ttl
+        entry = CacheEntry(tuple(records), criteria_fields(criteria), expires_at, is_complete(criteria, records))
+        self._entries[criteria] = entry
+        for name in entry.fields:
+            self._by_field.setdefault(name, set()).add(criteria)
+        while len(self._entries) > self._max_size:
+            self._discard(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def _discard(self, criteria: Criteria) -> None:
+        entry = self._entries.pop(criteria)
+        for name in entry.fields:
+            keys = self._by_field[name]
+            keys.discard(criteria)
+            if not keys:
+                del self._by_field[name]
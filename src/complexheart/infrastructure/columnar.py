@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import heapq
+import operator
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from itertools import repeat
+from typing import Any, Protocol
+
+from complexheart.domain.criteria import Criteria, Filter, Operator, Order, OrderType
+from complexheart.domain.evaluation import compile_value_predicate, field_getter, is_ordered, sort_value
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+Mask = Any
+
+_COMPARISONS: dict[Operator, Callable[[Any, Any], Any]] = {
+    Operator.EQUAL: operator.eq,
+    Operator.NOT_EQUAL: operator.ne,
+    Operator.GT: operator.gt,
+    Operator.GTE: operator.ge,
+    Operator.LT: operator.lt,
+    Operator.LTE: operator.le,
+}
+
+_NEGATIONS: dict[Operator, Operator] = {
+    Operator.NOT_IN: Operator.IN,
+    Operator.NOT_CONTAINS: Operator.CONTAINS,
+}
+
+_INVERT = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+_NUMPY_NATIVE_TYPES = ({int}, {float}, {bool}, {str})
+_NUMPY_NUMERIC_KINDS = frozenset("biuf")
+
+
+class MaskBackend(Protocol):
+    name: str
+
+    def column(self, values: Iterable[Any]) -> Sequence[Any]: ...
+
+    def full(self, size: int, value: bool) -> Mask: ...
+
+    def evaluate(self, f: Filter, column: Sequence[Any]) -> Mask: ...
+
+    def and_(self, left: Mask, right: Mask) -> Mask: ...
+
+    def or_(self, left: Mask, right: Mask) -> Mask: ...
+
+    def invert(self, mask: Mask) -> Mask: ...
+
+    def any(self, mask: Mask) -> bool: ...
+
+    def indices(self, mask: Mask) -> Sequence[int]: ...
+
+    def sort(
+        self, indices: Sequence[int], columns: Sequence[Sequence[Any]], descending: bool, size: int
+    ) -> Sequence[int]: ...
+
+
+def _sort_indices(indices: Iterable[int], columns: Sequence[Sequence[Any]], descending: bool, size: int) -> list[int]:
+    def key(i: int) -> Any:
+        return tuple(sort_value(c[i]) for c in columns)
+
+    return (heapq.nlargest if descending else heapq.nsmallest)(size, indices, key=key)
+
+
+class PythonMaskBackend:
+    name = "python"
+
+    def column(self, values: Iterable[Any]) -> list[Any]:
+        return list(values)
+
+    def full(self, size: int, value: bool) -> bytearray:
+        return bytearray(b"\x01" if value else b"\x00") * size
+
+    def evaluate(self, f: Filter, column: Sequence[Any]) -> bytes | bytearray:
+        if f.operator in _NEGATIONS:
+            return self.invert(self.evaluate(Filter.unchecked(f.field, _NEGATIONS[f.operator], f.value), column))
+        compare = _COMPARISONS.get(f.operator)
+        try:
+            if compare is not None:
+                return bytearray(map(compare, column, repeat(f.value)))
+            if f.operator == Operator.IN and isinstance(f.value, list | tuple | set | frozenset):
+                return bytearray(map(frozenset(f.value).__contains__, column))
+        except TypeError:
+            pass
+        return bytearray(map(compile_value_predicate(f), column))
+
+    def and_(self, left: bytes | bytearray, right: bytes | bytearray) -> bytes:
+        return (int.from_bytes(left, "little") & int.from_bytes(right, "little")).to_bytes(len(left), "little")
+
+    def or_(self, left: bytes | bytearray, right: bytes | bytearray) -> bytes:
+        return (int.from_bytes(left, "little") | int.from_bytes(right, "little")).to_bytes(len(left), "little")
+
+    def invert(self, mask: bytes | bytearray) -> bytes | bytearray:
+        return mask.translate(_INVERT)
+
+    def any(self, mask: bytes | bytearray) -> bool:
+        return mask.find(1) != -1
+
+    def indices(self, mask: bytes | bytearray) -> list[int]:
+        result: list[int] = []
+        position = mask.find(1)
+        while position != -1:
+            result.append(position)
+            position = mask.find(1, position + 1)
+        return result
+
+    def sort(self, indices: Sequence[int], columns: Sequence[Sequence[Any]], descending: bool, size: int) -> list[int]:
+        return _sort_indices(indices, columns, descending, size)
+
+
+class NumpyMaskBackend:
+    name = "numpy"
+
+    def column(self, values: Iterable[Any]) -> Any:
+        if isinstance(values, np.ndarray):
+            return values
+        items = list(values)
+        if {type(v) for v in items} in _NUMPY_NATIVE_TYPES:
+            return np.asarray(items)
+        column = np.empty(len(items), dtype=object)
+        for i, value in enumerate(items):
+            column[i] = value
+        return column
+
+    def full(self, size: int, value: bool) -> Any:
+        return np.full(size, value, dtype=bool)
+
+    def evaluate(self, f: Filter, column: Any) -> Any:
+        if f.operator in _NEGATIONS:
+            return ~self.evaluate(Filter.unchecked(f.field, _NEGATIONS[f.operator], f.value), column)
+        compare = _COMPARISONS.get(f.operator)
+        try:
+            if compare is not None and np.ndim(f.value) == 0:
+                result = compare(column, f.value)
+                if isinstance(result, np.ndarray) and result.dtype == bool:
+                    return result
+            if f.operator == Operator.IN and _isin_compatible(column, f.value):
+                return np.isin(column, list(f.value))
+        except (TypeError, ValueError, OverflowError):
+            pass
+        # Python scalars keep the in-memory semantics, e.g. `np.int64(1) == [1, 2]` would broadcast.
+        return np.fromiter(map(compile_value_predicate(f), column.tolist()), dtype=bool, count=len(column))
+
+    def and_(self, left: Any, right: Any) -> Any:
+        return left & right
+
+    def or_(self, left: Any, right: Any) -> Any:
+        return left | right
+
+    def invert(self, mask: Any) -> Any:
+        return ~mask
+
+    def any(self, mask: Any) -> bool:
+        return bool(mask.any())
+
+    def indices(self, mask: Any) -> Any:
+        return np.flatnonzero(mask)
+
+    def sort(self, indices: Any, columns: Sequence[Any], descending: bool, size: int) -> Any:
+        if any(c.dtype == object for c in columns):
+            return np.asarray(_sort_indices(indices.tolist(), columns, descending, size), dtype=np.intp)
+        if descending:
+            # Sort the reversed selection and flip it back so ties keep their original order.
+            reversed_indices = indices[::-1]
+            keys = tuple(c[reversed_indices] for c in reversed(columns))
+            return reversed_indices[np.lexsort(keys)][::-1]
+        return indices[np.lexsort(tuple(c[indices] for c in reversed(columns)))]
+
+
+def _isin_compatible(column: Any, value: Any) -> bool:
+    # np.isin coerces the values to one dtype, so only use it when that cannot change equality.
+    if not isinstance(value, list | tuple):
+        return False
+    types = {type(v) for v in value}
+    if column.dtype.kind == "U":
+        return types <= {str}
+    return column.dtype.kind in _NUMPY_NUMERIC_KINDS and types <= {bool, int, float}
+
+
+def _backend(name: str) -> MaskBackend:
+    if name == "auto":
+        name = "python" if np is None else "numpy"
+    if name == "python":
+        return PythonMaskBackend()
+    if name == "numpy":
+        if np is None:
+            raise ImportError("numpy backend requires numpy: pip install complex-heart-criteria[numpy]")
+        return NumpyMaskBackend()
+    raise ValueError(f"Unknown columnar backend: {name}")
+
+
+class ColumnarTable:
+    def __init__(self, columns: Mapping[str, Iterable[Any]], backend: str = "auto") -> None:
+        self._backend = _backend(backend)
+        self._columns = {name: self._backend.column(values) for name, values in columns.items()}
+        sizes = {len(c) for c in self._columns.values()}
+        if len(sizes) > 1:
+            raise ValueError(f"All columns must have the same length, got {sorted(sizes)}")
+        self._size = sizes.pop() if sizes else 0
+
+    @staticmethod
+    def from_records(records: Iterable[Any], fields: Sequence[str], backend: str = "auto") -> ColumnarTable:
+        rows = list(records)
+        getters = {f: field_getter(f) for f in fields}
+        return ColumnarTable({f: [get(r) for r in rows] for f, get in getters.items()}, backend)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def backend(self) -> str:
+        return self._backend.name
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return tuple(self._columns)
+
+    def column(self, name: str) -> Sequence[Any]:
+        if name not in self._columns:
+            return self._backend.column([None] * self._size)
+        return self._columns[name]
+
+    def mask(self, criteria: Criteria) -> Mask:
+        backend = self._backend
+        result = None
+        for group in criteria.groups:
+            if not group:
+                continue
+            group_mask = None
+            for f in group:
+                filter_mask = backend.evaluate(f, self.column(f.field))
+                group_mask = filter_mask if group_mask is None else backend.and_(group_mask, filter_mask)
+                if not backend.any(group_mask):
+                    break
+            result = group_mask if result is None else backend.or_(result, group_mask)
+        if result is None:
+            return backend.full(self._size, True)
+        return result
+
+    def indices(self, criteria: Criteria) -> Sequence[int]:
+        return self._backend.indices(self.mask(criteria))
+
+    def select(self, criteria: Criteria) -> list[int]:
+        criteria = criteria.seek()
+        indices = self.indices(criteria)
+        page = criteria.page
+        indices = self._order(indices, criteria.order, page.offset + page.limit)
+        selected = indices[page.offset : page.offset + page.limit]
+        return selected.tolist() if hasattr(selected, "tolist") else list(selected)
+
+    def rows(self, criteria: Criteria) -> list[dict[str, Any]]:
+        columns = self._columns.items()
+        return [{name: _scalar(column[i]) for name, column in columns} for i in self.select(criteria)]
+
+    def _order(self, indices: Sequence[int], order: Order, size: int) -> Sequence[int]:
+        if not is_ordered(order) or len(indices) < 2:
+            return indices
+        columns = [self.column(name) for name in order.by]
+        return self._backend.sort(indices, columns, order.type == OrderType.DESC, size)
+
+
+def _scalar(value: Any) -> Any:
+    if np is not None and isinstance(value, np.generic):
+        return value.item()
+    return value
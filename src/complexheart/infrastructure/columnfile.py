@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import suppress
+from dataclasses import dataclass
+from itertools import islice
+from operator import itemgetter
+from typing import IO, Any, BinaryIO, Literal
+
+from complexheart.domain.criteria import Criteria, OrderType
+from complexheart.domain.evaluation import field_getter, sort_value
+from complexheart.infrastructure.columnar import ColumnarTable
+from complexheart.infrastructure.pruning import MAX_DISTINCT, FieldZone, ZoneMap
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+MAGIC = b"CHCOLF1\n"
+DEFAULT_BLOCK_SIZE = 65536
+
+_FORMATS: dict[str, Literal["?", "q", "d", "I"]] = {"bool": "?", "int64": "q", "float64": "d", "string": "I"}
+_TRAILER = struct.Struct("<Q")
+_ALIGNMENT = 8
+_key = itemgetter(0)
+
+
+@dataclass(frozen=True)
+class ColumnSegment:
+    kind: str
+    offset: int = 0
+    nulls: int | None = None
+    dictionary: tuple[str, ...] | None = None
+    zones: tuple[FieldZone, ...] = ()
+
+
+def _encode(name: str, values: Sequence[Any]) -> tuple[str, list[Any], bytes, tuple[str, ...] | None]:
+    types = {type(v) for v in values if v is not None}
+    if not types:
+        return "null", list(values), b"", None
+    if types == {bool}:
+        return "bool", list(values), bytes(v is True for v in values), None
+    if types == {int}:
+        try:
+            return "int64", list(values), array("q", (0 if v is None else v for v in values)).tobytes(), None
+        except OverflowError:
+            raise ValueError(f"Column {name} has integers outside the int64 range") from None
+    if types <= {int, float}:
+        floats = [None if v is None else float(v) for v in values]
+        return "float64", floats, array("d", (0.0 if v is None else v for v in floats)).tobytes(), None
+    if types == {str}:
+        dictionary = tuple(sorted({v for v in values if v is not None}))
+        codes = {v: i for i, v in enumerate(dictionary)}
+        return "string", list(values), array("I", (0 if v is None else codes[v] for v in values)).tobytes(), dictionary
+    raise TypeError(f"Unsupported types for column {name}: {sorted(t.__name__ for t in types)}")
+
+
+def _write_segment(out: IO[bytes], data: bytes) -> int:
+    out.write(bytes(-out.tell() % _ALIGNMENT))
+    offset = out.tell()
+    out.write(data)
+    return offset
+
+
+def _has_nulls(nulls: memoryview | None, start: int, stop: int) -> bool:
+    return nulls is not None and 1 in nulls[start:stop].tobytes()
+
+
+def _zone_to_json(zone: FieldZone) -> dict[str, Any]:
+    values = sorted(zone.values) if zone.values is not None else None
+    return {"count": zone.count, "nulls": zone.nulls, "min": zone.minimum, "max": zone.maximum, "values": values}
+
+
+def _zone_from_json(data: Mapping[str, Any]) -> FieldZone:
+    values = frozenset(data["values"]) if data["values"] is not None else None
+    return FieldZone(data["count"], data["nulls"], data["min"], data["max"], values=values)
+
+
+class ColumnFile:
+    def __init__(self, path: str | os.PathLike[str], backend: str = "auto") -> None:
+        self._backend = ColumnarTable({}, backend).backend
+        self._file: BinaryIO = open(path, "rb")  # noqa: SIM115
+        try:
+            header = self._read_header(path)
+        except BaseException:
+            self._file.close()
+            raise
+        if header["byteorder"] != sys.byteorder:
+            self._file.close()
+            raise ValueError(f"Column file {path} was written on a {header['byteorder']}-endian machine")
+        self._rows: int = header["rows"]
+        self._block_size: int = header["block_size"]
+        self._columns = {
+            c["name"]: ColumnSegment(
+                c["kind"],
+                c["offset"],
+                c["nulls"],
+                tuple(c["dictionary"]) if c["dictionary"] is not None else None,
+                tuple(_zone_from_json(z) for z in c["zones"]),
+            )
+            for c in header["columns"]
+        }
+        self._maps: dict[str, tuple[mmap.mmap | None, memoryview[Any], memoryview | None]] = {}
+
+    @staticmethod
+    def write(
+        path: str | os.PathLike[str], columns: Mapping[str, Sequence[Any]], block_size: int = DEFAULT_BLOCK_SIZE
+    ) -> None:
+        if block_size < 1:
+            raise ValueError(f"Block size must be positive, got {block_size}")
+        sizes = {len(c) for c in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError(f"All columns must have the same length, got {sorted(sizes)}")
+        rows = sizes.pop() if sizes else 0
+        metadata = []
+        with open(path, "wb") as out:
+            out.write(MAGIC)
+            for name, column in columns.items():
+                kind, values, data, dictionary = _encode(name, column)
+                zones = [
+                    _zone_to_json(FieldZone.from_values(values[start : start + block_size], MAX_DISTINCT))
+                    for start in range(0, rows, block_size)
+                ]
+                offset = _write_segment(out, data)
+                nulls = None
+                if any(v is None for v in values) and kind != "null":
+                    nulls = _write_segment(out, bytes(v is None for v in values))
+                metadata.append(
+                    {
+                        "name": name,
+                        "kind": kind,
+                        "offset": offset,
+                        "nulls": nulls,
+                        "dictionary": dictionary,
+                        "zones": zones,
+                    }
+                )
+            header = {"byteorder": sys.byteorder, "rows": rows, "block_size": block_size, "columns": metadata}
+            footer = json.dumps(header, separators=(",", ":")).encode()
+            out.write(footer)
+            out.write(_TRAILER.pack(len(footer)))
+            out.write(MAGIC)
+
+    @staticmethod
+    def write_records(
+        path: str | os.PathLike[str],
+        records: Iterable[Any],
+        fields: Sequence[str],
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        rows = list(records)
+        getters = {f: field_getter(f) for f in fields}
+        ColumnFile.write(path, {f: [get(r) for r in rows] for f, get in getters.items()}, block_size)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __enter__(self) -> ColumnFile:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return tuple(self._columns)
+
+    @property
+    def blocks(self) -> int:
+        return -(-self._rows // self._block_size)
+
+    @property
+    def mapped(self) -> tuple[str, ...]:
+        return tuple(self._maps)
+
+    def zone_map(self, block: int, fields: Iterable[str] | None = None) -> ZoneMap:
+        start = block * self._block_size
+        names = self._columns if fields is None else fields
+        zones = {name: self._columns[name].zones[block] for name in names if name in self._columns}
+        return ZoneMap(min(self._block_size, self._rows - start), zones)
+
+    def select(self, criteria: Criteria) -> list[int]:
+        criteria = criteria.seek()
+        page = criteria.page
+        matches = self._matches(criteria)
+        if criteria.has_order():
+            select = heapq.nlargest if criteria.order.type == OrderType.DESC else heapq.nsmallest
+            selected = select(page.offset + page.limit, matches, key=_key)[page.offset :]
+        else:
+            selected = list(islice(matches, page.offset, page.offset + page.limit))
+        return [row for _, row in selected]
+
+    def rows(self, criteria: Criteria, fields: Sequence[str] | None = None) -> list[dict[str, Any]]:
+        names = self.fields if fields is None else tuple(fields)
+        return [{name: self._value(name, row) for name in names} for row in self.select(criteria)]
+
+    def close(self) -> None:
+        for m, data, nulls in self._maps.values():
+            data.release()
+            if nulls is not None:
+                nulls.release()
+            if m is not None:
+                # Block arrays still referenced elsewhere keep the mapping alive until they are collected.
+                with suppress(BufferError):
+                    m.close()
+        self._maps.clear()
+        self._file.close()
+
+    def _read_header(self, path: str | os.PathLike[str]) -> dict[str, Any]:
+        f = self._file
+        size = f.seek(0, os.SEEK_END)
+        trailer = _TRAILER.size + len(MAGIC)
+        if size < len(MAGIC) + trailer:
+            raise ValueError(f"Not a column file: {path}")
+        f.seek(0)
+        start = f.read(len(MAGIC))
+        f.seek(size - trailer)
+        (length,) = _TRAILER.unpack(f.read(_TRAILER.size))
+        if start != MAGIC or f.read(len(MAGIC)) != MAGIC or length > size - len(MAGIC) - trailer:
+            raise ValueError(f"Not a column file: {path}")
+        f.seek(size - trailer - length)
+        header: dict[str, Any] = json.loads(f.read(length))
+        return header
+
+    def _map(self, name: str) -> tuple[memoryview[Any], memoryview | None]:
+        if name in self._maps:
+            _, data, nulls = self._maps[name]
+            return data, nulls
+        segment = self._columns[name]
+        fmt = _FORMATS[segment.kind]
+        length = self._rows * struct.calcsize(fmt)
+        if not self._rows:
+            self._maps[name] = (None, memoryview(b"").cast(fmt), None)
+            return self._maps[name][1], None
+        # Map only this column's data and null flags; offsets must be aligned to the allocation granularity.
+        end = segment.offset + length if segment.nulls is None else segment.nulls + self._rows
+        base = segment.offset - segment.offset % mmap.ALLOCATIONGRANULARITY
+        m = mmap.mmap(self._file.fileno(), end - base, access=mmap.ACCESS_READ, offset=base)
+        with memoryview(m) as view:
+            data = view[segment.offset - base : segment.offset - base + length].cast(fmt)
+            nulls = None if segment.nulls is None else view[segment.nulls - base : end - base]
+        self._maps[name] = (m, data, nulls)
+        return data, nulls
+
+    def _values(self, name: str, start: int, stop: int) -> list[Any]:
+        segment = self._columns.get(name)
+        if segment is None or segment.kind == "null":
+            return [None] * (stop - start)
+        data, nulls = self._map(name)
+        values: list[Any] = data[start:stop].tolist()
+        if segment.dictionary is not None:
+            dictionary = segment.dictionary
+            values = [dictionary[v] for v in values]
+        if nulls is not None and _has_nulls(nulls, start, stop):
+            values = [None if flag else v for v, flag in zip(values, nulls[start:stop].tobytes(), strict=True)]
+        return values
+
+    def _column(self, name: str, start: int, stop: int) -> Any:
+        segment = self._columns.get(name)
+        if self._backend == "numpy" and segment is not None and segment.dictionary is None and segment.kind != "null":
+            data, nulls = self._map(name)
+            if not _has_nulls(nulls, start, stop):
+                return np.frombuffer(data[start:stop], dtype=data.format)
+        return self._values(name, start, stop)
+
+    def _value(self, name: str, row: int) -> Any:
+        segment = self._columns.get(name)
+        if segment is None or segment.kind == "null":
+            return None
+        data, nulls = self._map(name)
+        if nulls is not None and nulls[row]:
+            return None
+        value = data[row]
+        return segment.dictionary[value] if segment.dictionary is not None else value
+
+    def _matches(self, criteria: Criteria) -> Iterator[tuple[tuple[Any, ...], int]]:
+        fields = list(dict.fromkeys(f.field for group in criteria.groups for f in group))
+        order = criteria.order.by if criteria.has_order() else ()
+        for block in range(self.blocks):
+            start = block * self._block_size
+            stop = min(start + self._block_size, self._rows)
+            indices: Iterable[int] = range(stop - start)
+            if fields:
+                if not self.zone_map(block, fields).may_match(criteria):
+                    continue
+                table = ColumnarTable({name: self._column(name, start, stop) for name in fields}, self._backend)
+                found = table.indices(criteria)
+                indices = found.tolist() if hasattr(found, "tolist") else found
+            if not order:
+                yield from (((), start + i) for i in indices)
+                continue
+            columns = [self._values(name, start, stop) for name in order]
+            for i in indices:
+                yield tuple(sort_value(c[i]) for c in columns), start + i
@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Collection, Iterable, Iterator, Sequence, Set
+from contextlib import suppress
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Any, Protocol, runtime_checkable
+
+from complexheart.domain.criteria import Filter, Operator
+from complexheart.domain.evaluation import as_collection, field_getter
+from complexheart.domain.normalization import Interval
+
+
+@dataclass(frozen=True)
+class IndexLookup:
+    ids: Set[int] | None = None
+    excluded: Set[int] = field(default_factory=frozenset)
+    consumed: tuple[Filter, ...] = ()
+
+
+class Index(Protocol):
+    field: str
+
+    def add(self, record_id: int, record: Any) -> None: ...
+
+    def remove(self, record_id: int, record: Any) -> None: ...
+
+    def lookup(self, filters: Sequence[Filter]) -> IndexLookup: ...
+
+
+@runtime_checkable
+class OrderedIndex(Protocol):
+    field: str
+
+    def ordered(self, descending: bool = False) -> Iterator[int] | None: ...
+
+
+@runtime_checkable
+class BulkIndex(Protocol):
+    field: str
+
+    def add_all(self, records: Iterable[tuple[int, Any]]) -> None: ...
+
+
+def intersect(left: Set[int] | None, right: Set[int]) -> Set[int]:
+    if left is None:
+        return right
+    if len(right) < len(left):
+        left, right = right, left
+    return {i for i in left if i in right}
+
+
+class HashIndex:
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._get = field_getter(field)
+        self._buckets: dict[Any, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def add(self, record_id: int, record: Any) -> None:
+        with suppress(TypeError):
+            self._buckets.setdefault(self._get(record), set()).add(record_id)
+
+    def remove(self, record_id: int, record: Any) -> None:
+        value = self._get(record)
+        try:
+            bucket = self._buckets.get(value)
+        except TypeError:
+            return
+        if bucket is not None:
+            bucket.discard(record_id)
+            if not bucket:
+                del self._buckets[value]
+
+    def ids(self, value: Any) -> Set[int]:
+        return self._buckets.get(value, frozenset())
+
+    def lookup(self, filters: Sequence[Filter]) -> IndexLookup:
+        ids: Set[int] | None = None
+        excluded: set[int] = set()
+        consumed: list[Filter] = []
+        for f in filters:
+            matched = self._matched(f)
+            if matched is None:
+                continue
+            if f.operator in (Operator.EQUAL, Operator.IN):
+                ids = intersect(ids, matched)
+            else:
+                excluded.update(matched)
+            consumed.append(f)
+        return IndexLookup(ids, excluded, tuple(consumed))
+
+    def _matched(self, f: Filter) -> Set[int] | None:
+        if f.operator in (Operator.EQUAL, Operator.NOT_EQUAL):
+            values: Iterable[Any] = (f.value,)
+        elif f.operator in (Operator.IN, Operator.NOT_IN):
+            values = as_collection(f.value)
+        else:
+            return None
+        try:
+            buckets: list[Set[int]] = [self._buckets.get(v, frozenset()) for v in values]
+            if any(v != v for v in values):
+                # Buckets match NaN by identity, while the evaluator compares it unequal to everything.
+                return None
+        except TypeError:
+            return None
+        if len(buckets) == 1:
+            return buckets[0]
+        return set().union(*buckets)
+
+
+_RANGE_OPERATORS = (Operator.EQUAL, Operator.GT, Operator.GTE, Operator.LT, Operator.LTE)
+
+_key = itemgetter(0)
+
+
+class RangeIndex:
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._get = field_getter(field)
+        self._entries: list[tuple[Any, int]] = []
+        self._nulls: set[int] = set()
+        self._nans: set[int] = set()
+        self._unordered: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._nulls) + len(self._nans) + len(self._unordered)
+
+    def add(self, record_id: int, record: Any) -> None:
+        value = self._get(record)
+        if not self._unsortable(record_id, value):
+            self._insert(value, record_id)
+
+    def add_all(self, records: Iterable[tuple[int, Any]]) -> None:
+        entries = []
+        for record_id, record in records:
+            value = self._get(record)
+            if not self._unsortable(record_id, value):
+                entries.append((value, record_id))
+        try:
+            self._entries = sorted(self._entries + entries)
+        except TypeError:
+            for value, record_id in entries:
+                self._insert(value, record_id)
+
+    def remove(self, record_id: int, record: Any) -> None:
+        self._nulls.discard(record_id)
+        self._nans.discard(record_id)
+        self._unordered.discard(record_id)
+        entry = (self._get(record), record_id)
+        with suppress(TypeError):
+            position = bisect_left(self._entries, entry)
+            if position < len(self._entries) and self._entries[position] == entry:
+                del self._entries[position]
+
+    def lookup(self, filters: Sequence[Filter]) -> IndexLookup:
+        if self._unordered:
+            return IndexLookup()
+        interval = Interval()
+        consumed: list[Filter] = []
+        for f in filters:
+            if f.operator not in _RANGE_OPERATORS or f.value is None:
+                continue
+            if f.value != f.value:
+                # NaN satisfies no comparison, and bisecting on it would select every entry.
+                return IndexLookup(frozenset(), frozenset(), (f,))
+            try:
+                interval = interval.tighten(f)
+            except TypeError:
+                continue
+            consumed.append(f)
+        if not consumed:
+            return IndexLookup()
+        try:
+            ids = {record_id for _, record_id in self.scan(interval)}
+        except TypeError:
+            return IndexLookup()
+        return IndexLookup(ids, frozenset(), tuple(consumed))
+
+    def scan(self, interval: Interval) -> list[tuple[Any, int]]:
+        entries = self._entries
+        start, stop = 0, len(entries)
+        if interval.low is not None:
+            search = bisect_left if interval.low.inclusive else bisect_right
+            start = search(entries, interval.low.value, key=_key)
+        if interval.high is not None:
+            search = bisect_right if interval.high.inclusive else bisect_left
+            stop = search(entries, interval.high.value, key=_key)
+        return entries[start:stop]
+
+    def ordered(self, descending: bool = False) -> Iterator[int] | None:
+        if self._unordered or self._nans:
+            return None
+        if descending:
+            return self._descending()
+        return self._ascending()
+
+    def _unsortable(self, record_id: int, value: Any) -> bool:
+        if value is None:
+            self._nulls.add(record_id)
+            return True
+        if value != value:
+            # NaN never satisfies a range filter and would break the sort order of the entries.
+            self._nans.add(record_id)
+            return True
+        return False
+
+    def _insert(self, value: Any, record_id: int) -> None:
+        try:
+            insort(self._entries, (value, record_id))
+        except TypeError:
+            self._unordered.add(record_id)
+
+    def _ascending(self) -> Iterator[int]:
+        yield from sorted(self._nulls)
+        for _, record_id in self._entries:
+            yield record_id
+
+    def _descending(self) -> Iterator[int]:
+        # Walk runs of equal keys backwards while keeping insertion order inside each run, as a stable sort would.
+        entries = self._entries
+        stop = len(entries)
+        while stop > 0:
+            start = bisect_left(entries, entries[stop - 1][0], 0, stop, key=_key)
+            for _, record_id in entries[start:stop]:
+                yield record_id
+            stop = start
+        yield from sorted(self._nulls)
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def like_literals(pattern: str) -> list[str]:
+    return [literal for literal in re.split(r"[%_]", pattern) if literal]
+
+
+class TrigramIndex:
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._get = field_getter(field)
+        self._postings: dict[str, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def add(self, record_id: int, record: Any) -> None:
+        value = self._get(record)
+        if isinstance(value, str):
+            for trigram in trigrams(value):
+                self._postings.setdefault(trigram, set()).add(record_id)
+
+    def remove(self, record_id: int, record: Any) -> None:
+        value = self._get(record)
+        if not isinstance(value, str):
+            return
+        for trigram in trigrams(value):
+            posting = self._postings.get(trigram)
+            if posting is not None:
+                posting.discard(record_id)
+                if not posting:
+                    del self._postings[trigram]
+
+    def lookup(self, filters: Sequence[Filter]) -> IndexLookup:
+        required: set[str] = set()
+        for f in filters:
+            if f.operator == Operator.LIKE and isinstance(f.value, str):
+                for literal in like_literals(f.value):
+                    required.update(trigrams(literal))
+        if not required:
+            return IndexLookup()
+        postings: list[Set[int]] = sorted((self._postings.get(t, frozenset()) for t in required), key=len)
+        ids: Set[int] = postings[0]
+        for posting in postings[1:]:
+            if not ids:
+                break
+            ids = intersect(ids, posting)
+        # Trigram candidates are a superset of the matches: the LIKE filters stay in place to verify them.
+        return IndexLookup(ids)
+
+
+def _elements(value: Any) -> Collection[Any] | None:
+    if isinstance(value, Collection) and not isinstance(value, str | bytes | bytearray):
+        return value
+    return None
+
+
+class InvertedIndex:
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._get = field_getter(field)
+        self._postings: dict[Any, set[int]] = {}
+        self._opaque: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def add(self, record_id: int, record: Any) -> None:
+        value = self._get(record)
+        if value is None:
+            return
+        elements = _elements(value)
+        try:
+            if elements is None:
+                raise TypeError
+            keys = set(elements)
+        except TypeError:
+            self._opaque.add(record_id)
+            return
+        for key in keys:
+            self._postings.setdefault(key, set()).add(record_id)
+
+    def remove(self, record_id: int, record: Any) -> None:
+        self._opaque.discard(record_id)
+        elements = _elements(self._get(record))
+        if elements is None:
+            return
+        with suppress(TypeError):
+            for key in set(elements):
+                posting = self._postings.get(key)
+                if posting is not None:
+                    posting.discard(record_id)
+                    if not posting:
+                        del self._postings[key]
+
+    def ids(self, element: Any) -> Set[int]:
+        return self._postings.get(element, frozenset())
+
+    def lookup(self, filters: Sequence[Filter]) -> IndexLookup:
+        # Strings and other non-collection values answer CONTAINS by their own rules, so they are always re-checked.
+        opaque = self._opaque
+        ids: Set[int] | None = None
+        excluded: set[int] = set()
+        consumed: list[Filter] = []
+        for f in sorted(filters, key=self._size):
+            if f.operator not in (Operator.CONTAINS, Operator.NOT_CONTAINS):
+                continue
+            try:
+                posting = self.ids(f.value)
+            except TypeError:
+                continue
+            if f.operator == Operator.CONTAINS:
+                ids = intersect(ids, posting | opaque if opaque else posting)
+            else:
+                excluded.update(posting)
+            if not opaque:
+                consumed.append(f)
+        return IndexLookup(ids, excluded, tuple(consumed))
+
+    def _size(self, f: Filter) -> int:
+        try:
+            return len(self.ids(f.value))
+        except TypeError:
+            return 0
+
+
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def bitmap_ids(bitmap: int) -> list[int]:
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    return [position * 8 + bit for position, byte in enumerate(data) if byte for bit in _BYTE_BITS[byte]]
+
+
+def _set_bit(bits: bytearray, position: int) -> None:
+    offset = position >> 3
+    if offset >= len(bits):
+        bits.extend(bytes(max(offset + 1, 2 * len(bits)) - len(bits)))
+    bits[offset] |= 1 << (position & 7)
+
+
+def _clear_bit(bits: bytearray, position: int) -> None:
+    offset = position >> 3
+    if offset < len(bits):
+        bits[offset] &= ~(1 << (position & 7)) & 0xFF
+
+
+class BitmapIndex:
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._get = field_getter(field)
+        self._bits: dict[Any, bytearray] = {}
+        self._counts: dict[Any, int] = {}
+        self._universe = bytearray()
+        self._opaque: set[int] = set()
+        self._cache: dict[Any, int] = {}
+        self._universe_cache: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def add(self, record_id: int, record: Any) -> None:
+        value = self._get(record)
+        try:
+            bits = self._bits.setdefault(value, bytearray())
+        except TypeError:
+            self._opaque.add(record_id)
+            return
+        _set_bit(bits, record_id)
+        _set_bit(self._universe, record_id)
+        self._counts[value] = self._counts.get(value, 0) + 1
+        self._cache.pop(value, None)
+        self._universe_cache = None
+
+    def remove(self, record_id: int, record: Any) -> None:
+        self._opaque.discard(record_id)
+        value = self._get(record)
+        try:
+            bits = self._bits.get(value)
+        except TypeError:
+            return
+        if bits is None:
+            return
+        _clear_bit(bits, record_id)
+        _clear_bit(self._universe, record_id)
+        self._cache.pop(value, None)
+        self._universe_cache = None
+        self._counts[value] -= 1
+        if not self._counts[value]:
+            del self._bits[value], self._counts[value]
+
+    def universe(self) -> int:
+        if self._universe_cache is None:
+            self._universe_cache = int.from_bytes(self._universe, "little")
+        return self._universe_cache
+
+    def value_bitmap(self, value: Any) -> int:
+        bitmap = self._cache.get(value)
+        if bitmap is None:
+            bits = self._bits.get(value)
+            bitmap = self._cache[value] = int.from_bytes(bits, "little") if bits is not None else 0
+        return bitmap
+
+    def bitmap(self, f: Filter) -> int | None:
+        if self._opaque:
+            return None
+        values: Iterable[Any]
+        if f.operator in (Operator.EQUAL, Operator.NOT_EQUAL):
+            values = (f.value,)
+        elif f.operator in (Operator.IN, Operator.NOT_IN):
+            values = as_collection(f.value)
+        else:
+            return None
+        try:
+            bitmap = 0
+            for value in values:
+                if value != value:
+                    # Bitmaps match NaN by identity, while the evaluator compares it unequal to everything.
+                    return None
+                bitmap |= self.value_bitmap(value)
+        except TypeError:
+            return None
+        if f.operator in (Operator.NOT_EQUAL, Operator.NOT_IN):
+            return self.universe() & ~bitmap
+        return bitmap
+
+    def lookup(self, filters: Sequence[Filter]) -> IndexLookup:
+        result: int | None = None
+        consumed: list[Filter] = []
+        for f in filters:
+            bitmap = self.bitmap(f)
+            if bitmap is None:
+                continue
+            result = bitmap if result is None else result & bitmap
+            consumed.append(f)
+        if result is None:
+            return IndexLookup()
+        return IndexLookup(set(bitmap_ids(result)), frozenset(), tuple(consumed))
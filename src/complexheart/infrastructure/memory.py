@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Set
+from itertools import islice
+from typing import Generic, TypeVar
+
+from complexheart.domain.criteria import Criteria, Filter, FilterGroup, OrderType
+from complexheart.domain.evaluation import compile_group, top
+from complexheart.infrastructure.indexes import BitmapIndex, BulkIndex, Index, OrderedIndex, bitmap_ids, intersect
+from complexheart.infrastructure.view import MaterializedView
+
+T = TypeVar("T")
+
+
+class InMemoryRepository(Generic[T]):
+    def __init__(self, records: Iterable[T] = (), indexes: Iterable[Index] = ()) -> None:
+        self._records: dict[int, T] = {}
+        self._next_id = 0
+        self._indexes: dict[str, list[Index]] = {}
+        self._views: list[MaterializedView[T]] = []
+        self.add_all(records)
+        for index in indexes:
+            self.add_index(index)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._records.values())
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._records
+
+    def add_index(self, index: Index) -> None:
+        if isinstance(index, BulkIndex):
+            index.add_all(self._records.items())
+        else:
+            for record_id, record in self._records.items():
+                index.add(record_id, record)
+        self._indexes.setdefault(index.field, []).append(index)
+
+    def materialize(self, criteria: Criteria) -> MaterializedView[T]:
+        view = MaterializedView(criteria, self._records.items())
+        self._views.append(view)
+        return view
+
+    def drop_view(self, view: MaterializedView[T]) -> None:
+        self._views.remove(view)
+
+    def add(self, record: T) -> int:
+        record_id = self._next_id
+        self._next_id += 1
+        self._records[record_id] = record
+        for indexes in self._indexes.values():
+            for index in indexes:
+                index.add(record_id, record)
+        for view in self._views:
+            view.insert(record_id, record)
+        return record_id
+
+    def add_all(self, records: Iterable[T]) -> list[int]:
+        return [self.add(record) for record in records]
+
+    def get(self, record_id: int) -> T:
+        return self._records[record_id]
+
+    def update(self, record_id: int, record: T) -> None:
+        previous = self._records[record_id]
+        for indexes in self._indexes.values():
+            for index in indexes:
+                index.remove(record_id, previous)
+                index.add(record_id, record)
+        self._records[record_id] = record
+        for view in self._views:
+            view.update(record_id, record)
+
+    def remove(self, record_id: int) -> T:
+        record = self._records.pop(record_id)
+        for indexes in self._indexes.values():
+            for index in indexes:
+                index.remove(record_id, record)
+        for view in self._views:
+            view.delete(record_id)
+        return record
+
+    def match(self, criteria: Criteria) -> list[T]:
+        criteria = criteria.seek()
+        ids = self.match_ids(criteria)
+        walk = self._index_order(criteria, len(ids))
+        if walk is not None:
+            page = criteria.page
+            matched = set(ids) if len(ids) < len(self._records) else None
+            hits = walk if matched is None else (i for i in walk if i in matched)
+            return [self._records[i] for i in islice(hits, page.offset, page.offset + page.limit)]
+        records = self._records
+        return top((records[i] for i in ids), criteria.order, criteria.page.limit, criteria.page.offset)
+
+    def match_ids(self, criteria: Criteria) -> list[int]:
+        groups = [g for g in criteria.groups if g]
+        if not groups:
+            return list(self._records)
+        bitmap = self._bitmap(groups)
+        if bitmap is not None:
+            return bitmap_ids(bitmap)
+        if len(groups) == 1:
+            return self._group_ids(groups[0])
+        ids: set[int] = set()
+        for group in groups:
+            ids.update(self._group_ids(group))
+        return sorted(ids)
+
+    def _bitmap(self, groups: list[FilterGroup]) -> int | None:
+        # Only when every filter has a bitmap: the whole criteria is then answered with integer AND / OR.
+        result = 0
+        for group in groups:
+            conjunction: int | None = None
+            for f in group:
+                bitmap = self._filter_bitmap(f)
+                if bitmap is None:
+                    return None
+                conjunction = bitmap if conjunction is None else conjunction & bitmap
+            result |= conjunction or 0
+        return result
+
+    def _filter_bitmap(self, f: Filter) -> int | None:
+        for index in self._indexes.get(f.field, ()):
+            if isinstance(index, BitmapIndex):
+                bitmap = index.bitmap(f)
+                if bitmap is not None:
+                    return bitmap
+        return None
+
+    def _group_ids(self, group: FilterGroup) -> list[int]:
+        candidates: Set[int] | None = None
+        excluded: set[int] = set()
+        consumed: set[int] = set()
+        for field, filters in _by_field(group).items():
+            for index in self._indexes.get(field, ()):
+                lookup = index.lookup(filters)
+                if lookup.ids is not None:
+                    candidates = intersect(candidates, lookup.ids)
+                excluded.update(lookup.excluded)
+                consumed.update(id(f) for f in lookup.consumed)
+        remaining = [f for f in group if id(f) not in consumed]
+        check = compile_group(FilterGroup(tuple(remaining)))
+        records = self._records
+        if candidates is None:
+            return [i for i, r in records.items() if i not in excluded and check(r)]
+        return sorted(i for i in candidates if i not in excluded and check(records[i]))
+
+    def _index_order(self, criteria: Criteria, matches: int) -> Iterator[int] | None:
+        order = criteria.order
+        if not criteria.has_order() or len(order.by) != 1 or matches < 2:
+            return None
+        # Walking the index visits about needed * total / matches entries; sorting the matches costs k log k.
+        needed = criteria.page.offset + criteria.page.limit
+        if needed * len(self._records) > matches * matches * matches.bit_length():
+            return None
+        for index in self._indexes.get(order.by[0], ()):
+            if isinstance(index, OrderedIndex):
+                walk = index.ordered(order.type == OrderType.DESC)
+                if walk is not None:
+                    return walk
+        return None
+
+
+def _by_field(group: FilterGroup) -> dict[str, list[Filter]]:
+    result: dict[str, list[Filter]] = {}
+    for f in group:
+        result.setdefault(f.field, []).append(f)
+    return result
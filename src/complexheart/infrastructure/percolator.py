@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Hashable, Iterator
+from contextlib import suppress
+from dataclasses import dataclass
+from itertools import count
+from operator import itemgetter
+from typing import Any
+
+from complexheart.domain.criteria import Criteria, Filter, FilterGroup, Operator
+from complexheart.domain.evaluation import Getter, Predicate, as_collection, compile_group, field_getter
+from complexheart.domain.normalization import RANGE_OPERATORS, Interval
+
+_key = itemgetter(0)
+
+
+@dataclass(frozen=True)
+class Anchor:
+    field: str
+    values: tuple[Any, ...] = ()
+    interval: Interval | None = None
+
+
+@dataclass(frozen=True)
+class RuleGroup:
+    rule: Hashable
+    check: Predicate
+    anchor: Anchor | None
+
+
+def anchor(group: FilterGroup) -> Anchor | None:
+    ranges: dict[str, list[Filter]] = {}
+    in_anchor: Anchor | None = None
+    for f in group:
+        if f.operator == Operator.EQUAL:
+            try:
+                hash(f.value)
+            except TypeError:
+                continue
+            return Anchor(f.field, (f.value,))
+        if f.operator == Operator.IN and in_anchor is None:
+            members = as_collection(f.value)
+            if isinstance(members, frozenset):
+                in_anchor = Anchor(f.field, tuple(members))
+        elif f.operator in RANGE_OPERATORS and f.value is not None:
+            ranges.setdefault(f.field, []).append(f)
+    if in_anchor is not None:
+        return in_anchor
+    for name, filters in ranges.items():
+        interval = Interval()
+        try:
+            for f in filters:
+                interval = interval.tighten(f)
+        except TypeError:
+            continue
+        return Anchor(name, interval=interval)
+    return None
+
+
+_BLOCK = 64
+
+
+def _reaches(high: Any, value: Any) -> bool:
+    if high is None:
+        return True
+    try:
+        return bool(high >= value)
+    except TypeError:
+        return True
+
+
+class RangeRules:
+    def __init__(self) -> None:
+        self._lows: list[tuple[Any, int, Any]] = []
+        self._highs: list[tuple[Any, int]] = []
+        self._bounds: list[Any] | None = None
+
+    def __len__(self) -> int:
+        return len(self._lows) + len(self._highs)
+
+    def add(self, key: int, interval: Interval) -> None:
+        if interval.low is not None:
+            high = interval.high.value if interval.high is not None else None
+            insort(self._lows, (interval.low.value, key, high))
+            self._bounds = None
+        elif interval.high is not None:
+            insort(self._highs, (interval.high.value, key))
+
+    def remove(self, key: int, interval: Interval) -> None:
+        entries: list[Any]
+        entry: tuple[Any, ...]
+        if interval.low is not None:
+            high = interval.high.value if interval.high is not None else None
+            entries, entry = self._lows, (interval.low.value, key, high)
+            self._bounds = None
+        elif interval.high is not None:
+            entries, entry = self._highs, (interval.high.value, key)
+        else:
+            return
+        with suppress(TypeError):
+            position = bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                del entries[position]
+
+    def candidates(self, value: Any) -> Iterator[int]:
+        # Groups whose lower bound is at most the value and whose upper bound, if any, is at least the value.
+        # Blocks of the lower-bound list whose highest upper bound is below the value are skipped whole.
+        lows = self._lows
+        try:
+            stop = bisect_right(lows, value, key=_key)
+        except TypeError:
+            stop = 0
+        bounds = self._block_bounds()
+        for block in range(0, stop, _BLOCK):
+            if not _reaches(bounds[block // _BLOCK], value):
+                continue
+            for _, key, high in lows[block : min(block + _BLOCK, stop)]:
+                if _reaches(high, value):
+                    yield key
+        # Then groups bounded only above that are at least the value; each list is guarded on its own.
+        try:
+            start = bisect_left(self._highs, value, key=_key)
+        except TypeError:
+            return
+        for _, key in self._highs[start:]:
+            yield key
+
+    def _block_bounds(self) -> list[Any]:
+        if self._bounds is None:
+            bounds = []
+            for block in range(0, len(self._lows), _BLOCK):
+                highs = [high for _, _, high in self._lows[block : block + _BLOCK]]
+                try:
+                    bounds.append(None if None in highs else max(highs))
+                except TypeError:
+                    bounds.append(None)
+            self._bounds = bounds
+        return self._bounds
+
+
+class Percolator:
+    def __init__(self) -> None:
+        self._keys = count()
+        self._rules: dict[Hashable, tuple[int, list[int]]] = {}
+        self._groups: dict[int, RuleGroup] = {}
+        self._values: dict[str, dict[Any, set[int]]] = {}
+        self._ranges: dict[str, RangeRules] = {}
+        self._getters: dict[str, Getter] = {}
+        self._scan: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __contains__(self, rule: object) -> bool:
+        return rule in self._rules
+
+    def add(self, rule: Hashable, criteria: Criteria) -> None:
+        if rule in self._rules:
+            self.remove(rule)
+        groups = [g for g in criteria.groups if g] or [FilterGroup()]
+        keys = []
+        for group in groups:
+            key = next(self._keys)
+            self._groups[key] = RuleGroup(rule, compile_group(group), anchor(group))
+            self._index(key)
+            keys.append(key)
+        self._rules[rule] = (keys[0], keys)
+
+    def remove(self, rule: Hashable) -> None:
+        _, keys = self._rules.pop(rule)
+        for key in keys:
+            self._unindex(key)
+            del self._groups[key]
+
+    def match(self, record: Any) -> list[Hashable]:
+        matched: dict[Hashable, int] = {}
+        groups = self._groups
+        for key in self._candidates(record):
+            group = groups[key]
+            if group.rule not in matched and group.check(record):
+                matched[group.rule] = self._rules[group.rule][0]
+        return sorted(matched, key=matched.__getitem__)
+
+    def _candidates(self, record: Any) -> Iterator[int]:
+        yield from self._scan
+        for name, postings in self._values.items():
+            try:
+                keys = postings.get(self._getters[name](record))
+            except TypeError:
+                continue
+            if keys:
+                yield from keys
+        for name, ranges in self._ranges.items():
+            value = self._getters[name](record)
+            if value is None:
+                continue
+            try:
+                yield from ranges.candidates(value)
+            except TypeError:
+                continue
+
+    def _index(self, key: int) -> None:
+        a = self._groups[key].anchor
+        if a is None:
+            self._scan.add(key)
+            return
+        self._getters.setdefault(a.field, field_getter(a.field))
+        if a.interval is None:
+            postings = self._values.setdefault(a.field, {})
+            for value in a.values:
+                postings.setdefault(value, set()).add(key)
+            return
+        try:
+            self._ranges.setdefault(a.field, RangeRules()).add(key, a.interval)
+        except TypeError:
+            self._scan.add(key)
+
+    def _unindex(self, key: int) -> None:
+        self._scan.discard(key)
+        a = self._groups[key].anchor
+        if a is None:
+            return
+        if a.interval is None:
+            postings = self._values[a.field]
+            for value in a.values:
+                keys = postings.get(value)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del postings[value]
+            return
+        ranges = self._ranges.get(a.field)
+        if ranges is not None:
+            ranges.remove(key, a.interval)
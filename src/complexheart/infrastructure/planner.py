@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from complexheart.domain.criteria import Criteria, Filter, FilterGroup, Operator
+from complexheart.infrastructure.statistics import Statistics
+
+COST: dict[Operator, float] = {
+    Operator.EQUAL: 1.0,
+    Operator.NOT_EQUAL: 1.0,
+    Operator.GT: 1.2,
+    Operator.GTE: 1.2,
+    Operator.LT: 1.2,
+    Operator.LTE: 1.2,
+    Operator.IN: 1.5,
+    Operator.NOT_IN: 1.5,
+    Operator.CONTAINS: 2.0,
+    Operator.NOT_CONTAINS: 2.0,
+    Operator.LIKE: 5.0,
+    Operator.NOT_LIKE: 5.0,
+}
+
+
+class Planner:
+    def __init__(self, statistics: Statistics, costs: dict[Operator, float] | None = None) -> None:
+        self._statistics = statistics
+        self._costs = {**COST, **(costs or {})}
+
+    def cost(self, f: Filter) -> float:
+        return self._costs[f.operator]
+
+    def selectivity(self, f: Filter) -> float:
+        return self._statistics.selectivity(f)
+
+    def group_selectivity(self, group: FilterGroup) -> float:
+        result = 1.0
+        for f in group:
+            result *= self.selectivity(f)
+        return result
+
+    def group_cost(self, group: FilterGroup) -> float:
+        # Expected cost with short-circuiting: each filter only runs when every previous one matched.
+        cost, reached = 0.0, 1.0
+        for f in group:
+            cost += reached * self.cost(f)
+            reached *= self.selectivity(f)
+        return cost
+
+    def plan_group(self, group: FilterGroup) -> FilterGroup:
+        # AND short-circuits on the first miss: cheapest filters per rejected record go first.
+        def rank(f: Filter) -> float:
+            rejected = 1.0 - self.selectivity(f)
+            return self.cost(f) / rejected if rejected > 0 else float("inf")
+
+        return FilterGroup(tuple(sorted(group, key=rank)))
+
+    def plan(self, criteria: Criteria) -> Criteria:
+        groups = [self.plan_group(g) for g in criteria.groups if g]
+
+        # OR short-circuits on the first hit: likeliest and cheapest branches go first.
+        def rank(group: FilterGroup) -> float:
+            matched = self.group_selectivity(group)
+            return self.group_cost(group) / matched if matched > 0 else float("inf")
+
+        return Criteria(tuple(sorted(groups, key=rank)), criteria.order, criteria.page)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from complexheart.domain.criteria import Criteria, Filter, FilterGroup, Operator
+from complexheart.domain.evaluation import as_collection, compile_like, field_getter
+
+MAX_DISTINCT = 64
+
+
+@dataclass(frozen=True)
+class FieldZone:
+    count: int = 0
+    nulls: int = 0
+    minimum: Any = None
+    maximum: Any = None
+    ordered: bool = True
+    values: frozenset[Any] | None = None
+
+    @staticmethod
+    def from_values(values: Iterable[Any], max_distinct: int = MAX_DISTINCT) -> FieldZone:
+        count = nulls = 0
+        minimum = maximum = None
+        ordered = True
+        distinct: set[Any] | None = set()
+        for value in values:
+            if value is None:
+                nulls += 1
+                continue
+            count += 1
+            if distinct is not None:
+                try:
+                    distinct.add(value)
+                except TypeError:
+                    distinct = None
+                else:
+                    if len(distinct) > max_distinct:
+                        distinct = None
+            if not ordered:
+                continue
+            try:
+                if value != value:
+                    # NaN compares false with everything, so it cannot bound the range.
+                    continue
+                if minimum is None or value < minimum:
+                    minimum = value
+                if maximum is None or value > maximum:
+                    maximum = value
+            except TypeError:
+                ordered, minimum, maximum = False, None, None
+        return FieldZone(count, nulls, minimum, maximum, ordered, frozenset(distinct) if distinct is not None else None)
+
+    def may_contain(self, value: Any) -> bool:
+        if value is None:
+            return self.nulls > 0
+        if not self.count:
+            return False
+        if self.values is not None:
+            try:
+                return value in self.values
+            except TypeError:
+                return True
+        return self._within(value, value)
+
+    def may_match(self, f: Filter) -> bool:
+        op = f.operator
+        if op == Operator.EQUAL:
+            return self.may_contain(f.value)
+        if op == Operator.IN:
+            return any(self.may_contain(v) for v in as_collection(f.value))
+        if op == Operator.NOT_EQUAL:
+            return not self._only((f.value,))
+        if op == Operator.NOT_IN:
+            return not self._only(as_collection(f.value))
+        if op in (Operator.GT, Operator.GTE, Operator.LT, Operator.LTE):
+            if f.value is None or not self.count:
+                return False
+            if op in (Operator.GT, Operator.GTE):
+                return self._compare(self.maximum, f.value, op == Operator.GT)
+            return self._compare(f.value, self.minimum, op == Operator.LT)
+        if op == Operator.LIKE:
+            return self._may_be_like(str(f.value))
+        return True
+
+    def _only(self, members: Collection[Any]) -> bool:
+        if self.nulls and None not in members:
+            return False
+        if not self.count:
+            return True
+        if self.values is None:
+            try:
+                return (
+                    self.ordered
+                    and self.minimum is not None
+                    and self.minimum == self.maximum
+                    and self.minimum in members
+                )
+            except TypeError:
+                return False
+        try:
+            # `in` matches a stored NaN by identity, but NaN != NaN holds for the evaluator.
+            return all(v == v and v in members for v in self.values)
+        except TypeError:
+            return False
+
+    def _within(self, low: Any, high: Any) -> bool:
+        if not self.ordered or self.minimum is None:
+            return True
+        try:
+            return bool(self.maximum >= low and self.minimum <= high)
+        except TypeError:
+            return True
+
+    def _compare(self, larger: Any, smaller: Any, strict: bool) -> bool:
+        if not self.ordered or larger is None or smaller is None:
+            return True
+        try:
+            return bool(larger > smaller if strict else larger >= smaller)
+        except TypeError:
+            return True
+
+    def _may_be_like(self, pattern: str) -> bool:
+        if not self.count:
+            return False
+        if self.values is not None:
+            matches = compile_like(pattern)
+            return any(isinstance(v, str) and matches(v) for v in self.values)
+        prefix = pattern.split("%", 1)[0].split("_", 1)[0]
+        if not prefix or not isinstance(self.minimum, str) or not isinstance(self.maximum, str):
+            return True
+        return self.maximum >= prefix and self.minimum[: len(prefix)] <= prefix
+
+
+@dataclass(frozen=True)
+class ZoneMap:
+    rows: int
+    fields: Mapping[str, FieldZone] = field(default_factory=dict)
+
+    @staticmethod
+    def from_records(records: Sequence[Any], fields: Sequence[str], max_distinct: int = MAX_DISTINCT) -> ZoneMap:
+        zones = {}
+        for name in fields:
+            get = field_getter(name)
+            zones[name] = FieldZone.from_values((get(r) for r in records), max_distinct)
+        return ZoneMap(len(records), zones)
+
+    @staticmethod
+    def from_columns(columns: Mapping[str, Sequence[Any]], max_distinct: int = MAX_DISTINCT) -> ZoneMap:
+        rows = max((len(c) for c in columns.values()), default=0)
+        return ZoneMap(rows, {name: FieldZone.from_values(c, max_distinct) for name, c in columns.items()})
+
+    def may_match_group(self, group: FilterGroup) -> bool:
+        if not self.rows:
+            return False
+        for f in group:
+            zone = self.fields.get(f.field)
+            if zone is not None and not zone.may_match(f):
+                return False
+        return True
+
+    def may_match(self, criteria: Criteria) -> bool:
+        groups = [g for g in criteria.groups if g]
+        if not groups:
+            return self.rows > 0
+        return any(self.may_match_group(g) for g in groups)
+
+
+def prune(criteria: Criteria, zones: Sequence[ZoneMap]) -> list[int]:
+    return [i for i, zone in enumerate(zones) if zone.may_match(criteria)]
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import count
+from typing import Any
+
+from complexheart.domain.criteria import Criteria, Filter, Operator, OrderType
+
+FilterShape = tuple[str, Operator, int]
+CriteriaShape = tuple[tuple[tuple[FilterShape, ...], ...], tuple[tuple[str, ...], OrderType] | None]
+
+PARAMSTYLES = ("qmark", "numeric", "named", "format", "pyformat")
+
+_COMPARISONS = {
+    Operator.EQUAL: "=",
+    Operator.NOT_EQUAL: "<>",
+    Operator.GT: ">",
+    Operator.GTE: ">=",
+    Operator.LT: "<",
+    Operator.LTE: "<=",
+    Operator.LIKE: "LIKE",
+    Operator.NOT_LIKE: "NOT LIKE",
+    Operator.CONTAINS: "LIKE",
+    Operator.NOT_CONTAINS: "NOT LIKE",
+}
+
+_LISTS = {Operator.IN: "IN", Operator.NOT_IN: "NOT IN"}
+
+
+@dataclass(frozen=True)
+class SqlStatement:
+    sql: str
+    params: tuple[Any, ...] | dict[str, Any]
+
+    def __str__(self) -> str:
+        return self.sql
+
+
+def quote_identifier(name: str) -> str:
+    return ".".join('"' + part.replace('"', '""') + '"' for part in name.split("."))
+
+
+def arity_bucket(size: int) -> int:
+    if size <= 1:
+        return size
+    return 1 << (size - 1).bit_length()
+
+
+# Backslash escapes string literals on MySQL drivers, so LIKE patterns use a character no dialect treats specially.
+LIKE_ESCAPE = "!"
+
+
+def _escape_like(value: str) -> str:
+    return value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", LIKE_ESCAPE + "%").replace("_", LIKE_ESCAPE + "_")
+
+
+def _list_values(value: Any) -> list[Any]:
+    if isinstance(value, str) or not isinstance(value, Sequence | set | frozenset):
+        return [value]
+    return list(value)
+
+
+def filter_shape(f: Filter) -> FilterShape:
+    if f.operator in _LISTS:
+        return f.field, f.operator, arity_bucket(len(_list_values(f.value)))
+    if f.operator in (Operator.EQUAL, Operator.NOT_EQUAL) and f.value is None:
+        return f.field, f.operator, 0
+    return f.field, f.operator, 1
+
+
+def criteria_shape(criteria: Criteria) -> CriteriaShape:
+    groups = tuple(tuple(filter_shape(f) for f in group) for group in criteria.groups if group)
+    order = (criteria.order.by, criteria.order.type) if criteria.has_order() else None
+    return groups, order
+
+
+class SqlCompiler:
+    def __init__(
+        self,
+        table: str,
+        columns: Sequence[str] = (),
+        paramstyle: str = "qmark",
+        cache_size: int = 512,
+    ) -> None:
+        if paramstyle not in PARAMSTYLES:
+            raise ValueError(f"Unknown paramstyle: {paramstyle}")
+        self._table = quote_identifier(table)
+        self._columns = ", ".join(quote_identifier(c) for c in columns) if columns else "*"
+        self._paramstyle = paramstyle
+        self._render_cached = lru_cache(maxsize=cache_size)(self._render)
+
+    @staticmethod
+    def sqlite(table: str, columns: Sequence[str] = ()) -> SqlCompiler:
+        return SqlCompiler(table, columns, "qmark")
+
+    @property
+    def paramstyle(self) -> str:
+        return self._paramstyle
+
+    def cache_info(self) -> Any:
+        return self._render_cached.cache_info()
+
+    def clear_cache(self) -> None:
+        self._render_cached.cache_clear()
+
+    def compile(self, criteria: Criteria) -> SqlStatement:
+        criteria = criteria.seek()
+        sql = self._render_cached(criteria_shape(criteria))
+        values = self._values(criteria)
+        if self._paramstyle in ("named", "pyformat"):
+            return SqlStatement(sql, {f"p{i}": v for i, v in enumerate(values, start=1)})
+        return SqlStatement(sql, tuple(values))
+
+    def _values(self, criteria: Criteria) -> list[Any]:
+        values: list[Any] = []
+        for group in criteria.groups:
+            for f in group:
+                if f.operator in _LISTS:
+                    items = _list_values(f.value)
+                    values.extend(items)
+                    values.extend(items[-1:] * (arity_bucket(len(items)) - len(items)))
+                elif f.operator in (Operator.CONTAINS, Operator.NOT_CONTAINS):
+                    values.append(f"%{_escape_like(str(f.value))}%")
+                elif f.value is not None or f.operator not in (Operator.EQUAL, Operator.NOT_EQUAL):
+                    values.append(f.value)
+        values.append(criteria.page.limit)
+        values.append(criteria.page.offset)
+        return values
+
+    def _render(self, shape: CriteriaShape) -> str:
+        groups, order = shape
+        counter = count(1)
+        sql = f"SELECT {self._columns} FROM {self._table}"
+        if groups:
+            rendered = [" AND ".join(self._render_filter(s, counter) for s in group) for group in groups]
+            sql += " WHERE " + " OR ".join(f"({g})" for g in rendered)
+        if order is not None:
+            by, order_type = order
+            sql += " ORDER BY " + ", ".join(f"{quote_identifier(f)} {order_type}" for f in by)
+        return sql + f" LIMIT {self._placeholder(next(counter))} OFFSET {self._placeholder(next(counter))}"
+
+    def _render_filter(self, shape: FilterShape, counter: Iterator[int]) -> str:
+        field, op, arity = shape
+        column = quote_identifier(field)
+        if op in _LISTS:
+            if arity == 0:
+                return "1 = 1" if op == Operator.NOT_IN else "1 = 0"
+            placeholders = ", ".join(self._placeholder(next(counter)) for _ in range(arity))
+            return f"{column} {_LISTS[op]} ({placeholders})"
+        if arity == 0:
+            return f"{column} IS NULL" if op == Operator.EQUAL else f"{column} IS NOT NULL"
+        sql = f"{column} {_COMPARISONS[op]} {self._placeholder(next(counter))}"
+        if op in (Operator.CONTAINS, Operator.NOT_CONTAINS):
+            sql += f" ESCAPE '{LIKE_ESCAPE}'"
+        return sql
+
+    def _placeholder(self, position: int) -> str:
+        if self._paramstyle == "qmark":
+            return "?"
+        if self._paramstyle == "numeric":
+            return f":{position}"
+        if self._paramstyle == "named":
+            return f":p{position}"
+        if self._paramstyle == "format":
+            return "%s"
+        return f"%(p{position})s"
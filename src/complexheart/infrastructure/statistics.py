@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from complexheart.domain.criteria import Criteria, Filter, Operator
+from complexheart.domain.evaluation import compile_filter, compile_value_predicate, field_getter
+
+DEFAULT_SELECTIVITY: dict[Operator, float] = {
+    Operator.EQUAL: 0.1,
+    Operator.NOT_EQUAL: 0.9,
+    Operator.GT: 0.33,
+    Operator.GTE: 0.33,
+    Operator.LT: 0.33,
+    Operator.LTE: 0.33,
+    Operator.IN: 0.2,
+    Operator.NOT_IN: 0.8,
+    Operator.LIKE: 0.25,
+    Operator.NOT_LIKE: 0.75,
+    Operator.CONTAINS: 0.25,
+    Operator.NOT_CONTAINS: 0.75,
+}
+
+
+@dataclass
+class HitRate:
+    evaluated: int = 0
+    matched: int = 0
+
+    @property
+    def rate(self) -> float:
+        return self.matched / self.evaluated if self.evaluated else 0.0
+
+    def observe(self, matched: bool) -> None:
+        self.evaluated += 1
+        self.matched += matched
+
+
+@dataclass
+class FieldStatistics:
+    name: str
+    count: int = 0
+    nulls: int = 0
+    frequencies: Counter[Any] = field(default_factory=Counter)
+    saturated: bool = False
+    sample: list[Any] = field(default_factory=list)
+
+    @property
+    def cardinality(self) -> int:
+        return len(self.frequencies)
+
+    def histogram(self, bins: int = 10) -> list[tuple[Any, Any, int]]:
+        values = sorted(v for v in self.sample if isinstance(v, int | float) and not isinstance(v, bool))
+        if not values:
+            return []
+        low, high = values[0], values[-1]
+        width = (high - low) / bins or 1
+        counts = [0] * bins
+        for v in values:
+            counts[min(int((v - low) / width), bins - 1)] += 1
+        return [(low + i * width, low + (i + 1) * width, c) for i, c in enumerate(counts)]
+
+
+class Statistics:
+    def __init__(self, sample_size: int = 256, max_tracked_values: int = 1024, seed: int | None = None) -> None:
+        self._sample_size = sample_size
+        self._max_tracked_values = max_tracked_values
+        self._random = random.Random(seed)
+        self._fields: dict[str, FieldStatistics] = {}
+        self._hits: dict[Any, HitRate] = {}
+
+    def collect(self, records: Iterable[Any], fields: Sequence[str]) -> None:
+        getters = [(self._fields.setdefault(f, FieldStatistics(f)), field_getter(f)) for f in fields]
+        for record in records:
+            for stats, get in getters:
+                self._add(stats, get(record))
+
+    def field(self, name: str) -> FieldStatistics | None:
+        return self._fields.get(name)
+
+    def hit_rate(self, f: Filter) -> HitRate | None:
+        for key in _hit_keys(f):
+            hits = self._hits.get(key)
+            if hits is not None:
+                return hits
+        return None
+
+    def observe(self, f: Filter, matched: bool) -> None:
+        for key in _hit_keys(f):
+            self._hits.setdefault(key, HitRate()).observe(matched)
+
+    def observe_records(self, criteria: Criteria, records: Iterable[Any]) -> None:
+        checks = [(f, compile_filter(f)) for f in criteria.filters]
+        for record in records:
+            for f, check in checks:
+                self.observe(f, check(record))
+
+    def selectivity(self, f: Filter, min_observations: int = 100) -> float:
+        for key in _hit_keys(f):
+            hits = self._hits.get(key)
+            if hits is not None and hits.evaluated >= min_observations:
+                return hits.rate
+        stats = self._fields.get(f.field)
+        if stats is None or not stats.count:
+            return DEFAULT_SELECTIVITY[f.operator]
+        if not stats.saturated and f.operator in (Operator.EQUAL, Operator.NOT_EQUAL):
+            try:
+                rate = stats.frequencies[f.value] / stats.count
+            except TypeError:
+                rate = 0.0
+            return rate if f.operator == Operator.EQUAL else 1.0 - rate
+        check = compile_value_predicate(f)
+        return sum(1 for v in stats.sample if check(v)) / len(stats.sample)
+
+    def _add(self, stats: FieldStatistics, value: Any) -> None:
+        stats.count += 1
+        if value is None:
+            stats.nulls += 1
+        if not stats.saturated:
+            try:
+                if value in stats.frequencies or len(stats.frequencies) < self._max_tracked_values:
+                    stats.frequencies[value] += 1
+                else:
+                    stats.saturated = True
+            except TypeError:
+                stats.saturated = True
+        if len(stats.sample) < self._sample_size:
+            stats.sample.append(value)
+        else:
+            position = self._random.randrange(stats.count)
+            if position < self._sample_size:
+                stats.sample[position] = value
+
+
+def _hit_keys(f: Filter) -> list[Any]:
+    keys: list[Any] = [(f.field, f.operator)]
+    try:
+        hash(f.value)
+    except TypeError:
+        return keys
+    return [(f.field, f.operator, f.value), *keys]
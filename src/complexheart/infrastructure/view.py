@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections.abc import Hashable, Iterable
+from itertools import count
+from typing import Any, Generic, TypeVar
+
+from complexheart.domain.criteria import Criteria, OrderType
+from complexheart.domain.evaluation import sort_key
+
+T = TypeVar("T")
+
+
+class MaterializedView(Generic[T]):
+    def __init__(self, criteria: Criteria, records: Iterable[tuple[Hashable, T]] = ()) -> None:
+        self._criteria = criteria = criteria.seek()
+        self._matches = criteria.compile()
+        self._key = sort_key(criteria.order) if criteria.has_order() else None
+        self._descending = criteria.order.type == OrderType.DESC
+        self._sequence = count()
+        self._sequences: dict[Hashable, int] = {}
+        self._entries: list[tuple[Any, int, Hashable]] = []
+        self._positions: dict[Hashable, tuple[Any, int, Hashable]] = {}
+        self._records: dict[Hashable, T] = {}
+        for record_id, record in records:
+            sequence = self._sequences.setdefault(record_id, next(self._sequence))
+            self._positions.pop(record_id, None)
+            self._records.pop(record_id, None)
+            if self._matches(record):
+                self._positions[record_id] = self._entry(record_id, record, sequence)
+                self._records[record_id] = record
+        self._entries = sorted(self._positions.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._positions
+
+    @property
+    def criteria(self) -> Criteria:
+        return self._criteria
+
+    @property
+    def rows(self) -> list[T]:
+        page = self._criteria.page
+        entries = self._entries
+        if self._descending:
+            stop = len(entries) - page.offset
+            selected = entries[max(stop - page.limit, 0) : max(stop, 0)][::-1]
+        else:
+            selected = entries[page.offset : page.offset + page.limit]
+        return [self._records[record_id] for _, _, record_id in selected]
+
+    def insert(self, record_id: Hashable, record: T) -> bool:
+        if record_id in self._positions:
+            return self.update(record_id, record)
+        sequence = self._sequences.setdefault(record_id, next(self._sequence))
+        if not self._matches(record):
+            return False
+        entry = self._entry(record_id, record, sequence)
+        insort(self._entries, entry)
+        self._positions[record_id] = entry
+        self._records[record_id] = record
+        return self._visible(self._locate(entry))
+
+    def update(self, record_id: Hashable, record: T) -> bool:
+        removed = self._remove(record_id)
+        return self.insert(record_id, record) or removed
+
+    def delete(self, record_id: Hashable) -> bool:
+        self._sequences.pop(record_id, None)
+        return self._remove(record_id)
+
+    def _entry(self, record_id: Hashable, record: T, sequence: int) -> tuple[Any, int, Hashable]:
+        # Descending pages are read from the end, so ties are stored by reversed arrival to keep them stable.
+        return (self._key(record) if self._key else (), -sequence if self._descending else sequence, record_id)
+
+    def _remove(self, record_id: Hashable) -> bool:
+        entry = self._positions.pop(record_id, None)
+        if entry is None:
+            return False
+        del self._records[record_id]
+        position = self._locate(entry)
+        visible = self._visible(position)
+        del self._entries[position]
+        return visible
+
+    def _locate(self, entry: tuple[Any, int, Hashable]) -> int:
+        # Unordered keys such as NaN can leave bisect on a neighbour; fall back to an identity scan then.
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] is entry:
+            return position
+        return self._entries.index(entry)
+
+    def _visible(self, position: int) -> bool:
+        page = self._criteria.page
+        if self._descending:
+            position = len(self._entries) - 1 - position
+        return position < page.offset + page.limit
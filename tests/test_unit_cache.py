@@ -0,0 +1,189 @@
+import pytest
+
+from complexheart.domain.criteria import Criteria, Order
+from complexheart.infrastructure.cache import CachingRepository, criteria_fields, subsumes
+from complexheart.infrastructure.memory import InMemoryRepository
+
+CUSTOMERS = [
+    {"name": "Vincent", "age": 40, "status": "active"},
+    {"name": "Jules", "age": 35, "status": "active"},
+    {"name": "Mia", "age": 28, "status": "blocked"},
+]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _names(records):
+    return [r["name"] for r in records]
+
+
+def _cache(mocker, **kwargs):
+    repository = InMemoryRepository(CUSTOMERS)
+    spy = mocker.spy(repository, "match")
+    return CachingRepository(repository, **kwargs), spy
+
+
+def test_caching_repository_serves_equal_criteria_from_cache(mocker):
+    cache, spy = _cache(mocker)
+
+    first = cache.match(Criteria().filter("status", "==", "active"))
+    first.clear()
+    second = cache.match(Criteria().filter("status", "==", "active"))
+
+    assert _names(second) == ["Vincent", "Jules"]
+    assert spy.call_count == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_caching_repository_evicts_least_recently_used(mocker):
+    cache, _ = _cache(mocker, max_size=2)
+    active, blocked, old = (
+        Criteria().filter("status", "==", "active"),
+        Criteria().filter("status", "==", "blocked"),
+        Criteria().filter("age", ">", 30),
+    )
+
+    cache.match(active)
+    cache.match(blocked)
+    cache.match(active)
+    cache.match(old)
+
+    assert active in cache
+    assert blocked not in cache
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+
+def test_caching_repository_expires_entries_after_ttl(mocker):
+    clock = FakeClock()
+    cache, spy = _cache(mocker, ttl=10, clock=clock)
+    c = Criteria().filter("status", "==", "active")
+
+    cache.match(c)
+    clock.now = 9.9
+    cache.match(c)
+    clock.now = 10.0
+    cache.match(c)
+
+    assert spy.call_count == 2
+    assert cache.stats.expirations == 1
+
+
+def test_caching_repository_invalidates_entries_referencing_written_fields(mocker):
+    cache, _ = _cache(mocker)
+    by_status = Criteria().filter("status", "==", "active")
+    by_age = Criteria().filter("age", ">", 30)
+    ordered_by_status = Criteria().with_order(Order.asc(("status",)))
+
+    for c in (by_status, by_age, ordered_by_status):
+        cache.match(c)
+
+    assert cache.invalidate(["status", "email"]) == 2
+    assert by_status not in cache
+    assert ordered_by_status not in cache
+    assert by_age in cache
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats.invalidations == 3
+
+
+def test_criteria_fields_include_filters_and_order():
+    c = Criteria().filter("status", "==", "active").filter("age", ">", 30, group=1).order_by(("name",), "ASC")
+
+    assert criteria_fields(c) == {"status", "age", "name"}
+
+
+def test_caching_repository_rejects_invalid_bounds():
+    with pytest.raises(ValueError):
+        CachingRepository(InMemoryRepository(), max_size=0)
+    with pytest.raises(ValueError):
+        CachingRepository(InMemoryRepository(), ttl=0)
+
+
+def test_subsumes_checks_every_narrower_group_against_some_broader_group():
+    active = Criteria().filter("status", "==", "active")
+    adults = Criteria().filter("age", ">=", 18)
+
+    assert subsumes(active, active.filter("age", ">=", 30))
+    assert subsumes(Criteria().filter("status", "in", ["active", "blocked"]), active)
+    assert subsumes(active | adults, active.filter("age", "<", 30) | Criteria().filter("age", ">", 40))
+    assert subsumes(Criteria(), active)
+    assert not subsumes(active, Criteria())
+    assert not subsumes(active, adults)
+    assert not subsumes(adults, Criteria().filter("age", ">=", 10))
+
+
+def test_caching_repository_derives_narrower_results_from_complete_broader_ones(mocker):
+    cache, spy = _cache(mocker, subsumption=True)
+    active = Criteria().filter("status", "==", "active")
+
+    cache.match(active)
+    older = cache.match(active.filter("age", ">=", 36))
+    ordered = cache.match(active.filter("age", ">", 0).order_by(("age",), "ASC"))
+
+    assert _names(older) == ["Vincent"]
+    assert _names(ordered) == ["Jules", "Vincent"]
+    assert spy.call_count == 1
+    assert cache.stats.derived == 2
+
+
+def test_caching_repository_does_not_derive_from_truncated_or_differently_ordered_results(mocker):
+    cache, spy = _cache(mocker, subsumption=True)
+    first_page = Criteria().filter("status", "==", "active").limit(2)
+    by_name = Criteria().filter("status", "==", "active").order_by(("name",), "ASC")
+
+    cache.match(first_page)
+    cache.match(first_page.filter("age", ">", 30))
+    cache.match(by_name)
+    cache.match(by_name.filter("age", ">", 30).order_by(("age",), "DESC"))
+
+    assert spy.call_count == 4
+    assert cache.stats.derived == 0
+
+
+def test_caching_repository_shares_entries_between_equivalent_criteria(mocker):
+    cache, spy = _cache(mocker)
+
+    cache.match(Criteria().filter("status", "in", ["active", "blocked"]).filter("age", ">", 30))
+    cache.match(Criteria().filter("age", ">", 30).filter("status", "in", ["blocked", "active"]))
+
+    assert spy.call_count == 1
+    assert Criteria().filter("age", ">", 30).filter("status", "in", ("active", "blocked")) in cache
+
+
+def test_caching_repository_does_not_derive_from_entries_holding_invalidated_fields(mocker):
+    cache, spy = _cache(mocker, subsumption=True)
+    active = Criteria().filter("status", "==", "active").limit(100)
+
+    cache.match(active)
+    cache.repository.update(1, {"name": "Jules", "age": 20, "status": "active"})
+    cache.invalidate(["age"])
+    older = cache.match(active.filter("age", ">=", 30))
+    named = cache.match(active.filter("name", "==", "Vincent"))
+
+    assert active in cache
+    assert _names(older) == ["Vincent"]
+    assert _names(named) == ["Vincent"]
+    assert spy.call_count == 2
+    assert cache.stats.derived == 1
+
+
+def test_caching_repository_falls_back_to_backend_when_subsumption_cannot_compare(mocker):
+    cache, spy = _cache(mocker, subsumption=True)
+    cache.match(Criteria().filter("age", "!=", 2.5))
+    implies = mocker.patch("complexheart.infrastructure.cache.implies", side_effect=TypeError)
+
+    result = cache.match(Criteria().filter("age", "<", 2).filter("age", "<=", "a"))
+
+    assert result == []
+    assert implies.called
+    assert spy.call_count == 2
+    assert cache.stats.derived == 0
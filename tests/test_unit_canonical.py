@@ -0,0 +1,143 @@
+import os
+import subprocess
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from complexheart.domain import canonical
+from complexheart.domain.canonical import encode, fingerprint
+from complexheart.domain.criteria import Criteria, Cursor, Filter, FilterGroup
+
+
+def _criteria():
+    return (
+        Criteria()
+        .filter("status", "in", ["active", "trial"])
+        .filter("created_at", ">=", datetime(2024, 1, 1, 12, 30))
+        .filter("tags", "contains", "vip", group=1)
+        .order_by(("created_at", "id"), "DESC")
+        .limit(50)
+    )
+
+
+def test_fingerprint_is_deterministic_and_memoized(mocker):
+    c = _criteria()
+    expected = fingerprint(c)
+    spy = mocker.spy(canonical, "fingerprint")
+
+    assert c.fingerprint() == c.fingerprint() == expected
+    assert _criteria().fingerprint() == expected
+    assert len(expected) == 32
+    assert spy.call_count == 2
+
+
+def test_fingerprint_is_stable_across_processes():
+    script = (
+        "from datetime import datetime\n"
+        "from complexheart.domain.criteria import Criteria\n"
+        "print(Criteria().filter('status', 'in', ['active', 'trial'])"
+        ".filter('created_at', '>=', datetime(2024, 1, 1, 12, 30))"
+        ".filter('tags', 'contains', 'vip', group=1)"
+        ".order_by(('created_at', 'id'), 'DESC').limit(50).fingerprint())"
+    )
+    fingerprints = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed, "PYTHONPATH": os.pathsep.join(sys.path)},
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+
+    assert fingerprints == {_criteria().fingerprint()}
+
+
+def test_fingerprint_distinguishes_values_order_and_page():
+    base = Criteria().filter("age", ">", 30)
+
+    fingerprints = {
+        base.fingerprint(),
+        Criteria().filter("age", ">", 31).fingerprint(),
+        Criteria().filter("age", ">", "30").fingerprint(),
+        Criteria().filter("age", ">=", 30).fingerprint(),
+        base.order_by(("age",), "ASC").fingerprint(),
+        base.limit(10).fingerprint(),
+        base.with_cursor(Cursor(25, (30,))).fingerprint(),
+    }
+
+    assert len(fingerprints) == 7
+
+
+def test_fingerprint_distinguishes_tuples_from_lists():
+    as_tuple = Criteria().filter("x", "==", (1, 2))
+    as_list = Criteria().filter("x", "==", [1, 2])
+    members = Criteria().filter("x", "in", [(1, 2), [1, 2]]).canonical()
+
+    assert as_tuple.fingerprint() != as_list.fingerprint()
+    assert as_tuple.canonical() != as_list.canonical()
+    assert members.filters[0].value == ([1, 2], (1, 2))
+    assert Criteria().filter("x", "in", [1, 2]).fingerprint() == Criteria().filter("x", "in", (2, 1)).fingerprint()
+
+
+def test_fingerprint_distinguishes_dict_key_types():
+    int_keys = Criteria().filter("x", "==", {1: "a"})
+    str_keys = Criteria().filter("x", "==", {"1": "a"})
+
+    assert int_keys.fingerprint() != str_keys.fingerprint()
+    assert Criteria().filter("x", "==", {1: "a", "b": 2}).fingerprint() == (
+        Criteria().filter("x", "==", {"b": 2, 1: "a"}).fingerprint()
+    )
+
+
+def test_encode_handles_sets_dates_and_decimals():
+    c = Criteria(
+        (FilterGroup((Filter.in_("id", frozenset({3, 1, 2})), Filter.equal("day", date(2024, 2, 29)))),),
+    ).filter("price", "<", Decimal("9.99"))
+
+    assert '{"$set":["1","2","3"]}' in encode(c)
+    assert '{"$date":"2024-02-29"}' in encode(c)
+    assert '{"$decimal":"9.99"}' in encode(c)
+    assert encode(Criteria((FilterGroup(()),))) == encode(Criteria())
+
+
+def test_encode_rejects_values_without_canonical_form():
+    with pytest.raises(TypeError):
+        Criteria().filter("owner", "==", object()).fingerprint()
+
+
+def test_canonical_criteria_ignore_filter_group_and_in_order():
+    a, b = Filter.equal("a", 1), Filter.equal("b", 2)
+    left = Criteria((FilterGroup((a, b, a)), FilterGroup((Filter.in_("c", [2, 1, 2]),)), FilterGroup(())))
+    right = Criteria((FilterGroup((Filter.in_("c", (1, 2)),)), FilterGroup((b, a))))
+
+    assert left != right
+    assert left.canonical() == right.canonical()
+    assert hash(left.canonical()) == hash(right.canonical())
+    assert left.fingerprint() == right.fingerprint()
+    assert list(left.canonical().groups[0]) == [a, b]
+
+
+def test_canonical_criteria_keep_order_page_and_operator_semantics():
+    c = (
+        Criteria()
+        .filter("name", "in", "abc")
+        .filter("tags", "contains", [2, 1])
+        .filter("id", "not in", {3, 1})
+        .order_by(("b", "a"), "DESC")
+        .limit(5)
+    )
+
+    canonical = c.canonical()
+
+    assert canonical.order == c.order
+    assert canonical.page == c.page
+    assert set(canonical.filters) == {
+        Filter.in_("name", "abc"),
+        Filter.contains("tags", [2, 1]),
+        Filter.not_in("id", (1, 3)),
+    }
+    assert canonical.canonical() == canonical
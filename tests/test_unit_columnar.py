@@ -0,0 +1,146 @@
+import pytest
+
+from complexheart.domain.criteria import Criteria, Cursor, Filter, FilterGroup, Order
+from complexheart.infrastructure.columnar import ColumnarTable
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+BACKENDS = [
+    "python",
+    pytest.param("numpy", marks=pytest.mark.skipif(numpy is None, reason="numpy not installed")),
+]
+
+COLUMNS = {
+    "name": ["Vincent", "Jules", "Mia", "Butch", "Marsellus"],
+    "age": [40, 35, None, 38, 50],
+    "status": ["active", "active", "blocked", "active", "blocked"],
+    "tags": [["vip"], [], ["vip", "new"], ["new"], ["boss"]],
+}
+
+
+def _table(backend):
+    return ColumnarTable(COLUMNS, backend)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_columnar_evaluates_every_operator(backend):
+    table = _table(backend)
+
+    def names(f):
+        return [COLUMNS["name"][i] for i in table.select(Criteria().with_filter_group(FilterGroup.create(f)))]
+
+    assert names(Filter.equal("status", "blocked")) == ["Mia", "Marsellus"]
+    assert names(Filter.not_equal("status", "active")) == ["Mia", "Marsellus"]
+    assert names(Filter.greater_than("age", 38)) == ["Vincent", "Marsellus"]
+    assert names(Filter.greater_or_equal_than("age", 38)) == ["Vincent", "Butch", "Marsellus"]
+    assert names(Filter.less_than("age", 38)) == ["Jules"]
+    assert names(Filter.less_or_equal_than("age", 38)) == ["Jules", "Butch"]
+    assert names(Filter.in_("name", ["Mia", "Jules"])) == ["Jules", "Mia"]
+    assert names(Filter.not_in("name", ["Mia", "Jules"])) == ["Vincent", "Butch", "Marsellus"]
+    assert names(Filter.like("name", "M%")) == ["Mia", "Marsellus"]
+    assert names(Filter.not_like("name", "M%")) == ["Vincent", "Jules", "Butch"]
+    assert names(Filter.contains("tags", "vip")) == ["Vincent", "Mia"]
+    assert names(Filter.not_contains("tags", "vip")) == ["Jules", "Butch", "Marsellus"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_columnar_ands_within_group_and_ors_across_groups(backend):
+    c = (
+        Criteria()
+        .filter("status", "==", "active", group=0)
+        .filter("age", ">", 36, group=0)
+        .filter("name", "==", "Mia", group=1)
+    )
+
+    assert _table(backend).select(c) == [0, 2, 3]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_columnar_matches_compiled_predicate(backend):
+    c = Criteria().filter("status", "==", "active").filter("tags", "contains", "new", group=1)
+    records = [dict(zip(COLUMNS, row, strict=True)) for row in zip(*COLUMNS.values(), strict=True)]
+    matches = c.compile()
+
+    assert _table(backend).select(c) == [i for i, r in enumerate(records) if matches(r)]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_columnar_applies_order_and_page(backend):
+    table = _table(backend)
+
+    asc = Criteria().with_order(Order.asc(("status", "name")))
+    desc = Criteria().with_order(Order.desc(("age",))).with_page_limit(2).with_page_offset(1)
+
+    assert table.select(asc) == [3, 1, 0, 4, 2]
+    assert table.select(desc) == [0, 3]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_columnar_applies_cursor(backend):
+    c = Criteria().order_by(("status", "name")).with_cursor(Cursor(2, ("active", "Jules")))
+
+    assert _table(backend).select(c) == [0, 4]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_columnar_descending_order_keeps_ties_stable(backend):
+    table = ColumnarTable({"score": [1, 2, 1, 2]}, backend)
+
+    assert table.select(Criteria().with_order(Order.desc(("score",)))) == [1, 3, 0, 2]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_columnar_rows_materializes_selected_rows(backend):
+    rows = _table(backend).rows(Criteria().filter("name", "==", "Butch"))
+
+    assert rows == [{"name": "Butch", "age": 38, "status": "active", "tags": ["new"]}]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_columnar_missing_column_behaves_as_null(backend):
+    table = _table(backend)
+
+    assert table.select(Criteria().filter("missing", "==", None)) == [0, 1, 2, 3, 4]
+    assert table.select(Criteria().filter("missing", ">", 1)) == []
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_columnar_keeps_equal_length_list_values_as_cells(backend):
+    table = ColumnarTable({"tags": [["a"], ["b"]]}, backend)
+
+    assert len(table) == 2
+    assert table.select(Criteria().filter("tags", "contains", "b")) == [1]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_columnar_mixed_type_values_match_in_memory_semantics(backend):
+    table = ColumnarTable({"s": ["1", "a", "x"], "i": [1, 2, 3], "n": [1, 2.5, 3]}, backend)
+
+    assert table.select(Criteria().filter("s", "in", [1, "a"])) == [1]
+    assert table.select(Criteria().filter("i", "in", ["1", 2])) == [1]
+    assert table.select(Criteria().filter("i", "in", [1.0, True, 3])) == [0, 2]
+    assert table.select(Criteria().filter("i", "==", [1, 2])) == []
+    assert table.select(Criteria().filter("i", "==", "1")) == []
+    assert table.rows(Criteria().filter("n", "!=", 2.5)) == [{"s": "1", "i": 1, "n": 1}, {"s": "x", "i": 3, "n": 3}]
+    assert [type(row["n"]) for row in table.rows(Criteria())] == [int, float, int]
+
+
+def test_columnar_from_records():
+    table = ColumnarTable.from_records([{"a": 1}, {"a": 2}], ("a",), "python")
+
+    assert len(table) == 2
+    assert table.fields == ("a",)
+    assert table.select(Criteria().filter("a", ">", 1)) == [1]
+
+
+def test_columnar_rejects_columns_of_different_length():
+    with pytest.raises(ValueError):
+        ColumnarTable({"a": [1, 2], "b": [1]})
+
+
+def test_columnar_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        ColumnarTable({}, "arrow")
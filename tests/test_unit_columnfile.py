@@ -0,0 +1,127 @@
+import random
+from datetime import date
+
+import pytest
+
+from complexheart.domain.criteria import Criteria
+from complexheart.infrastructure.columnar import ColumnarTable
+from complexheart.infrastructure.columnfile import ColumnFile
+
+FIELDS = ("id", "age", "score", "name", "vip", "empty")
+
+
+def _records(size=1000, seed=7):
+    rnd = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "age": rnd.choice([None, *range(10, 60)]),
+            "score": rnd.random() if i % 7 else None,
+            "name": rnd.choice(["ann", "bob", "cid", None]),
+            "vip": rnd.choice([True, False]),
+            "empty": None,
+        }
+        for i in range(size)
+    ]
+
+
+@pytest.mark.parametrize("backend", ["python", "auto"])
+def test_column_file_scan_matches_in_memory_stream(tmp_path, backend):
+    records = _records()
+    path = tmp_path / "records.col"
+    ColumnFile.write_records(path, records, FIELDS, block_size=64)
+    criterias = [
+        Criteria().filter("age", ">", 40).filter("name", "like", "b%").order_by(("score", "id"), "DESC").limit(50),
+        Criteria().filter("id", "<", 100) | Criteria().filter("name", "in", ["cid"]).filter("vip", "==", True),
+        Criteria().filter("empty", "==", None).order_by(("age",), "ASC").limit(30).offset(5),
+        Criteria().filter("name", "!=", "ann").filter("missing", "==", None).limit(100),
+        Criteria().filter("score", "<=", 0.5).filter("age", "not in", [None, 20, 30]).limit(1000),
+        Criteria().order_by(("name", "id")).limit(40),
+    ]
+
+    with ColumnFile(path, backend) as columns:
+        assert len(columns) == 1000
+        assert columns.fields == FIELDS
+        assert columns.blocks == 16
+        for criteria in criterias:
+            assert columns.rows(criteria) == list(criteria.stream(records))
+
+
+def test_column_file_maps_only_referenced_columns(tmp_path):
+    path = tmp_path / "records.col"
+    ColumnFile.write_records(path, _records(), FIELDS, block_size=64)
+
+    with ColumnFile(path) as columns:
+        rows = columns.rows(Criteria().filter("age", ">=", 58).order_by(("id",), "DESC").limit(3), fields=("name",))
+
+        assert set(columns.mapped) == {"age", "id", "name"}
+        assert len(rows) == 3
+        assert set(rows[0]) == {"name"}
+
+
+def test_column_file_skips_pruned_blocks_and_stops_unordered_scans_early(tmp_path, mocker):
+    path = tmp_path / "records.col"
+    ColumnFile.write_records(path, _records(), FIELDS, block_size=64)
+
+    with ColumnFile(path) as columns:
+        evaluated = mocker.spy(ColumnarTable, "indices")
+        assert columns.select(Criteria().filter("id", ">=", 990)) == list(range(990, 1000))
+        assert evaluated.call_count == 1
+
+        evaluated.reset_mock()
+        assert columns.select(Criteria().filter("id", ">=", 0).limit(10)) == list(range(10))
+        assert evaluated.call_count == 1
+
+        assert columns.zone_map(15, ("id",)).fields["id"].minimum == 960
+        assert columns.zone_map(15).rows == 40
+
+
+def test_column_file_encodes_supported_types(tmp_path):
+    path = tmp_path / "types.col"
+    ColumnFile.write(
+        path,
+        {"n": [1, None, 3], "x": [1, 2.5, None], "flag": [True, None, False], "s": ["b", "a", "b"], "none": [None] * 3},
+    )
+
+    with ColumnFile(path) as columns:
+        assert columns.rows(Criteria()) == [
+            {"n": 1, "x": 1.0, "flag": True, "s": "b", "none": None},
+            {"n": None, "x": 2.5, "flag": None, "s": "a", "none": None},
+            {"n": 3, "x": None, "flag": False, "s": "b", "none": None},
+        ]
+
+    ColumnFile.write(path, {"n": []})
+    with ColumnFile(path) as columns:
+        assert len(columns) == 0
+        assert columns.rows(Criteria().filter("n", "==", 1)) == []
+
+
+@pytest.mark.parametrize("backend", ["python", "auto"])
+def test_column_file_scan_keeps_rows_next_to_nan(tmp_path, backend):
+    path = tmp_path / "nan.col"
+    values = [float("nan"), *map(float, range(100)), float("nan")]
+    ColumnFile.write(path, {"x": values}, block_size=10)
+
+    with ColumnFile(path, backend) as columns:
+        assert columns.select(Criteria().filter("x", ">", 1).limit(1000)) == list(range(3, 101))
+        assert columns.select(Criteria().filter("x", "<", 1).limit(1000)) == [1]
+        assert len(columns.select(Criteria().filter("x", "!=", None).limit(1000))) == 102
+
+
+def test_column_file_rejects_invalid_input(tmp_path):
+    path = tmp_path / "invalid.col"
+
+    with pytest.raises(TypeError, match="Unsupported types for column day"):
+        ColumnFile.write(path, {"day": [date(2024, 1, 1)]})
+    with pytest.raises(TypeError, match="Unsupported types for column mixed"):
+        ColumnFile.write(path, {"mixed": [1, "a"]})
+    with pytest.raises(ValueError, match="int64 range"):
+        ColumnFile.write(path, {"n": [2**63]})
+    with pytest.raises(ValueError, match="same length"):
+        ColumnFile.write(path, {"a": [1], "b": [1, 2]})
+    with pytest.raises(ValueError, match="Block size"):
+        ColumnFile.write(path, {"a": [1]}, block_size=0)
+
+    path.write_bytes(b"not a column file at all")
+    with pytest.raises(ValueError, match="Not a column file"):
+        ColumnFile(path)
@@ -1,7 +1,13 @@
+import base64
+import pickle
+from datetime import date, datetime
+
 import pytest
 
 from complexheart.domain.criteria import (
     Criteria,
+    CriteriaBuilder,
+    Cursor,
     Filter,
     FilterGroup,
     Operator,
@@ -898,3 +904,202 @@ def test_criteria_str_full():
     )
     expected = "WHERE (status == active AND age > 18) OR (role == admin) ORDER BY name DESC LIMIT 10 OFFSET 20"
     assert str(c) == expected
+
+
+def test_cursor_defaults():
+    c = Cursor()
+
+    assert c.limit == 25
+    assert c.offset == 0
+    assert c.after == ()
+
+
+def test_cursor_negative_limit_raises_value_error():
+    with pytest.raises(ValueError):
+        Cursor(-1)
+
+
+def test_cursor_token_round_trip():
+    c = Cursor(10, ("Vega", 3, datetime(2024, 1, 2, 3, 4, 5), date(2024, 1, 2), None))
+
+    assert Cursor.from_token(c.token, 10) == c
+    assert c.token.isascii()
+
+
+def test_cursor_invalid_token_raises_value_error():
+    with pytest.raises(ValueError):
+        Cursor.from_token("not-a-token!")
+
+    with pytest.raises(ValueError):
+        Cursor.from_token(base64.urlsafe_b64encode(b'{"a": 1}').decode())
+
+
+def test_criteria_with_cursor():
+    c = Criteria().with_cursor(Cursor(10, ("a",))).with_page_limit(5)
+
+    assert c.page == Cursor(5, ("a",))
+    assert str(c) == "LIMIT 5 AFTER ('a',)"
+    assert repr(c) == "Criteria(groups=0, cursor=(5, ('a',)))"
+
+
+def test_criteria_with_cursor_rejects_offset():
+    with pytest.raises(ValueError):
+        Criteria().with_page(Cursor.first()).with_page_offset(10)
+
+
+def test_criteria_cursor_after_reads_order_fields():
+    c = Criteria().order_by(("last_name", "id")).with_cursor(Cursor.first(10))
+
+    assert c.cursor_after({"last_name": "Vega", "id": 7, "age": 40}) == Cursor(10, ("Vega", 7))
+
+
+def test_criteria_cursor_after_requires_order():
+    with pytest.raises(ValueError):
+        Criteria().cursor_after({"id": 1})
+
+
+def test_criteria_seek_expands_cursor_into_filters():
+    c = (
+        Criteria()
+        .filter("status", "==", "active", group=0)
+        .filter("role", "==", "admin", group=1)
+        .order_by(("last_name", "id"), "DESC")
+        .with_cursor(Cursor(10, ("Vega", 7)))
+    )
+
+    seek = c.seek()
+
+    assert seek.page == Page(10, 0)
+    assert str(seek) == (
+        "WHERE (status == active AND last_name < Vega) OR "
+        "(status == active AND last_name == None) OR "
+        "(status == active AND last_name == Vega AND id < 7) OR "
+        "(status == active AND last_name == Vega AND id == None) OR "
+        "(role == admin AND last_name < Vega) OR "
+        "(role == admin AND last_name == None) OR "
+        "(role == admin AND last_name == Vega AND id < 7) OR "
+        "(role == admin AND last_name == Vega AND id == None) "
+        "ORDER BY last_name, id DESC LIMIT 10 OFFSET 0"
+    )
+
+
+def test_criteria_seek_first_page_and_offset_pages():
+    c = Criteria().filter("a", "==", 1).order_by(("id",))
+
+    assert c.seek() is c
+    assert c.with_cursor(Cursor.first(5)).seek() == c.with_page(Page(5, 0))
+
+
+def test_criteria_seek_validates_cursor_against_order():
+    with pytest.raises(ValueError):
+        Criteria().with_cursor(Cursor(5, (1,))).seek()
+
+    with pytest.raises(ValueError):
+        Criteria().order_by(("a", "b")).with_cursor(Cursor(5, (1,))).seek()
+
+
+def test_criteria_builder_matches_fluent_api():
+    built = (
+        Criteria.builder()
+        .filter("status", "==", "active")
+        .add_filter_greater_or_equal_than("age", 18)
+        .add_filter_in("role", ["admin", "owner"], group=1)
+        .add_filter_not_contains("tags", "banned", group=1)
+        .order_by(("created_at",), "desc")
+        .limit(10)
+        .offset(20)
+        .build()
+    )
+    fluent = (
+        Criteria()
+        .filter("status", "==", "active")
+        .filter("age", ">=", 18)
+        .filter("role", "in", ["admin", "owner"], group=1)
+        .filter("tags", "not contains", "banned", group=1)
+        .order_by(("created_at",), "DESC")
+        .limit(10)
+        .offset(20)
+    )
+
+    assert built == fluent
+
+
+def test_criteria_builder_appends_in_place_and_builds_independent_criteria():
+    builder = CriteriaBuilder()
+    for i in range(500):
+        builder.add_filter_not_equal("id", i)
+    first = builder.build()
+    builder.add_filter_equal("status", "active", group=2)
+
+    assert len(first.filters) == 500
+    assert len(builder) == 501
+    assert [len(g) for g in builder.build().groups] == [500, 0, 1]
+
+
+def test_criteria_builder_starts_from_existing_criteria():
+    c = Criteria().filter("a", "==", 1).with_cursor(Cursor(5, (3,))).order_by(("id",))
+
+    builder = c.to_builder().add_filter(Filter.equal("b", 2)).limit(8)
+
+    assert builder.build() == Criteria().filter("a", "==", 1).filter("b", "==", 2).with_cursor(
+        Cursor(8, (3,))
+    ).order_by(("id",))
+    assert c.filters == [Filter.equal("a", 1)]
+    with pytest.raises(ValueError):
+        builder.offset(5)
+
+
+def test_core_value_objects_are_slotted():
+    c = Criteria().filter("a", "==", 1).order_by(("a",))
+
+    for value in (c, c.groups[0], c.filters[0], c.order, c.page, Cursor()):
+        assert not hasattr(value, "__dict__")
+
+
+def test_hashes_are_memoized():
+    c = Criteria().filter("a", "in", [1, 2]).filter("b", "==", 2)
+    assert c._hash is None
+
+    expected = hash(c)
+
+    assert c._hash == expected
+    assert c.groups[0]._hash == hash(c.groups[0])
+    assert c.filters[0]._hash == hash(Filter.in_("a", [1, 2]))
+    assert hash(c) == expected
+
+
+def test_equality_does_not_depend_on_cached_hashes():
+    g1 = FilterGroup.create(Filter.equal("a", 1))
+    g2 = FilterGroup.create(Filter.equal("a", 2))
+    hash(g1), hash(g2)
+    lists = Criteria().filter("a", "in", [1, 2]), Criteria().filter("a", "in", [1.0, 2.0])
+    dicts = Criteria().filter("a", "==", {"x": 1, "y": 2}), Criteria().filter("a", "==", {"y": 2, "x": 1})
+
+    assert g1 == g1
+    assert g1 != g2
+    assert Criteria().with_filter_group(g1) == Criteria().with_filter_group(FilterGroup.create(Filter.equal("a", 1)))
+    for left, right in (lists, dicts):
+        assert left == right
+        hash(left), hash(right)
+        assert left == right
+        assert left.groups[0] == right.groups[0]
+
+
+def test_filter_unchecked_skips_validation():
+    f = Filter.unchecked("a", Operator.EQUAL, 1)
+
+    assert f == Filter.equal("a", 1)
+    assert hash(f) == hash(Filter.equal("a", 1))
+
+
+def test_criteria_pickle_round_trip_drops_caches():
+    c = Criteria().filter("a", "in", [1, 2]).order_by(("a",)).with_cursor(Cursor(5, (1,)))
+    hash(c)
+    c.compile()
+
+    restored = pickle.loads(pickle.dumps(c))
+
+    assert restored == c
+    assert restored._hash is None
+    assert restored._predicate is None
+    assert restored.filters[0]._hash is None
@@ -0,0 +1,191 @@
+from collections import namedtuple
+from types import SimpleNamespace
+
+from complexheart.domain.criteria import Criteria, Cursor, Filter, FilterGroup, Order, OrderType, Page
+from complexheart.domain.evaluation import (
+    compile_filter,
+    compile_group,
+    compile_like,
+    like_to_regex,
+    sort_key,
+    top,
+)
+
+Customer = namedtuple("Customer", ["name", "age", "tags"])
+
+
+def test_compile_filter_comparison_operators():
+    record = {"age": 30}
+
+    assert compile_filter(Filter.equal("age", 30))(record)
+    assert compile_filter(Filter.not_equal("age", 31))(record)
+    assert compile_filter(Filter.greater_than("age", 29))(record)
+    assert compile_filter(Filter.greater_or_equal_than("age", 30))(record)
+    assert compile_filter(Filter.less_than("age", 31))(record)
+    assert compile_filter(Filter.less_or_equal_than("age", 30))(record)
+    assert not compile_filter(Filter.greater_than("age", 30))(record)
+
+
+def test_compile_filter_comparison_with_incomparable_value_is_false():
+    assert not compile_filter(Filter.greater_than("age", 18))({"age": None})
+    assert not compile_filter(Filter.less_than("age", 18))({})
+
+
+def test_compile_filter_in_and_not_in():
+    assert compile_filter(Filter.in_("status", ["a", "b"]))({"status": "a"})
+    assert not compile_filter(Filter.in_("status", ["a", "b"]))({"status": "c"})
+    assert compile_filter(Filter.not_in("status", ["a", "b"]))({"status": "c"})
+    assert compile_filter(Filter.in_("tags", [["x"], ["y"]]))({"tags": ["y"]})
+
+
+def test_compile_filter_like_and_not_like():
+    assert compile_filter(Filter.like("name", "Vin%"))({"name": "Vincent"})
+    assert compile_filter(Filter.like("name", "V_ncent"))({"name": "Vincent"})
+    assert not compile_filter(Filter.like("name", "Vin%"))({"name": "Jules"})
+    assert compile_filter(Filter.not_like("name", "Vin%"))({"name": "Jules"})
+    assert not compile_filter(Filter.like("name", "Vin%"))({"name": None})
+
+
+def test_compile_filter_contains_and_not_contains():
+    assert compile_filter(Filter.contains("tags", "vip"))({"tags": ["vip", "new"]})
+    assert compile_filter(Filter.not_contains("tags", "vip"))({"tags": ["new"]})
+    assert not compile_filter(Filter.contains("tags", "vip"))({"tags": None})
+
+
+def test_like_to_regex_escapes_regex_characters():
+    assert like_to_regex("a.b%").fullmatch("a.bc")
+    assert not like_to_regex("a.b%").fullmatch("axbc")
+
+
+def test_compile_filter_reads_objects_and_namedtuples():
+    f = compile_filter(Filter.equal("name", "Vincent"))
+
+    assert f(SimpleNamespace(name="Vincent"))
+    assert f(Customer("Vincent", 30, []))
+    assert not f(SimpleNamespace(age=30))
+
+
+def test_compile_group_requires_all_filters():
+    group = Filter.equal("status", "active") + Filter.greater_than("age", 18) + Filter.contains("tags", "vip")
+    matches = compile_group(group)
+
+    assert matches({"status": "active", "age": 30, "tags": ["vip"]})
+    assert not matches({"status": "active", "age": 30, "tags": []})
+
+
+def test_compile_empty_group_matches_everything():
+    assert compile_group(FilterGroup.empty())({"a": 1})
+
+
+def test_criteria_compile_ors_groups():
+    c = (
+        Criteria()
+        .filter("status", "==", "active", group=0)
+        .filter("age", ">=", 18, group=0)
+        .filter("role", "==", "admin", group=1)
+    )
+    matches = c.compile()
+
+    assert matches({"status": "active", "age": 20, "role": "user"})
+    assert matches({"status": "blocked", "age": 20, "role": "admin"})
+    assert not matches({"status": "blocked", "age": 20, "role": "user"})
+
+
+def test_criteria_compile_without_filters_matches_everything():
+    assert Criteria().compile()({"a": 1})
+
+
+def test_criteria_compile_ignores_empty_groups():
+    c = Criteria().filter("role", "==", "admin", group=1)
+
+    assert not c.compile()({"role": "user"})
+
+
+def test_criteria_compile_is_cached():
+    c = Criteria().filter("a", "==", 1)
+
+    assert c.compile() is c.compile()
+
+
+def test_criteria_compile_cache_does_not_affect_equality():
+    c1 = Criteria().filter("a", "==", 1)
+    c2 = Criteria().filter("a", "==", 1)
+    c1.compile()
+
+    assert c1 == c2
+    assert hash(c1) == hash(c2)
+    assert repr(c1) == repr(c2)
+
+
+def test_top_matches_sort_then_paginate():
+    records = [{"a": i % 5, "b": i % 3, "i": i} for i in range(40)] + [{"a": None, "b": 0, "i": 99}]
+
+    for order in (Order.asc(("a", "b")), Order.desc(("a", "b")), Order.desc(("a",))):
+        ordered = sorted(records, key=sort_key(order), reverse=order.type == OrderType.DESC)
+        for page in (Page(5, 0), Page(7, 12), Page(100, 0), Page(0, 0)):
+            expected = ordered[page.offset : page.offset + page.limit]
+            assert top(iter(records), order, page.limit, page.offset) == expected
+
+
+def test_top_without_order_keeps_input_order():
+    assert top(iter(range(10)), Order.none(), 3, 2) == [2, 3, 4]
+
+
+def test_top_consumes_iterators_with_bounded_memory():
+    def generate():
+        for i in range(10000):
+            yield {"n": (i * 7919) % 10000}
+
+    assert [r["n"] for r in top(generate(), Order.desc(("n",)), 3, 1)] == [9998, 9997, 9996]
+
+
+def test_criteria_stream_yields_matches_lazily():
+    c = Criteria().filter("n", ">", 2).limit(2).offset(1)
+
+    result = c.stream({"n": n} for n in range(10))
+
+    assert next(result) == {"n": 4}
+    assert list(result) == [{"n": 5}]
+
+
+def test_criteria_stream_stops_pulling_input_after_the_page():
+    pulled = []
+
+    def source():
+        for n in range(1000):
+            pulled.append(n)
+            yield {"n": n}
+
+    result = list(Criteria().filter("n", ">=", 10).limit(5).offset(5).stream(source()))
+
+    assert [r["n"] for r in result] == [15, 16, 17, 18, 19]
+    assert len(pulled) == 20
+
+
+def test_criteria_stream_with_order_consumes_input_and_sorts():
+    c = Criteria().filter("n", "<", 50).order_by(("n",), "DESC").limit(3)
+
+    assert [r["n"] for r in c.stream({"n": n} for n in range(100))] == [49, 48, 47]
+
+
+def test_criteria_stream_applies_cursor():
+    c = Criteria().order_by(("n",)).with_cursor(Cursor(2, (5,)))
+
+    assert [r["n"] for r in c.stream({"n": n} for n in range(10))] == [6, 7]
+
+
+def test_compile_like_fast_paths_match_regex_semantics():
+    values = ["", "abc", "abcd", "xabc", "xabcx", "ab", "a%c", "ABC"]
+    patterns = ["", "abc", "abc%", "%abc", "%abc%", "%", "%%", "a_c", "a%c", "%b%c", "a\\%c", "%%abc%%"]
+
+    for pattern in patterns:
+        regex = like_to_regex(pattern)
+        matches = compile_like(pattern)
+        assert [matches(v) for v in values] == [regex.fullmatch(v) is not None for v in values], pattern
+
+
+def test_compile_like_is_cached():
+    compile_like.cache_clear()
+
+    assert compile_like("abc%") is compile_like("abc%")
+    assert compile_like.cache_info().hits == 1
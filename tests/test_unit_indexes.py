@@ -0,0 +1,302 @@
+import random
+
+from complexheart.domain.criteria import Filter
+from complexheart.domain.evaluation import compile_value_predicate
+from complexheart.infrastructure.indexes import (
+    BitmapIndex,
+    HashIndex,
+    InvertedIndex,
+    RangeIndex,
+    TrigramIndex,
+    bitmap_ids,
+)
+
+
+def _hash_index(field, values):
+    index = HashIndex(field)
+    for i, value in enumerate(values):
+        index.add(i, {field: value})
+    return index
+
+
+def test_hash_index_lookup_equal_and_in():
+    index = _hash_index("status", ["a", "b", "a", "c"])
+
+    assert set(index.lookup([Filter.equal("status", "a")]).ids) == {0, 2}
+    assert set(index.lookup([Filter.in_("status", ["a", "c"])]).ids) == {0, 2, 3}
+    assert set(index.lookup([Filter.equal("status", "z")]).ids) == set()
+
+
+def test_hash_index_lookup_intersects_filters_on_same_field():
+    index = _hash_index("status", ["a", "b", "a", "c"])
+
+    lookup = index.lookup([Filter.in_("status", ["a", "b"]), Filter.in_("status", ["b", "c"])])
+
+    assert set(lookup.ids) == {1}
+    assert len(lookup.consumed) == 2
+
+
+def test_hash_index_lookup_excludes_negative_filters():
+    index = _hash_index("status", ["a", "b", "a", "c"])
+
+    lookup = index.lookup([Filter.not_equal("status", "a"), Filter.not_in("status", ["c"])])
+
+    assert lookup.ids is None
+    assert set(lookup.excluded) == {0, 2, 3}
+
+
+def test_hash_index_does_not_consume_unsupported_filters():
+    index = _hash_index("status", ["a"])
+
+    lookup = index.lookup([Filter.like("status", "a%"), Filter.equal("status", ["a"])])
+
+    assert lookup.ids is None
+    assert lookup.consumed == ()
+
+
+def test_hash_index_remove_drops_empty_buckets():
+    index = _hash_index("status", ["a", "b"])
+
+    index.remove(1, {"status": "b"})
+
+    assert len(index) == 1
+
+
+def test_hash_index_ignores_unhashable_values():
+    index = _hash_index("tags", [["a"], "b"])
+
+    index.remove(0, {"tags": ["a"]})
+
+    assert set(index.ids("b")) == {1}
+
+
+def test_hash_index_does_not_consume_nan_filters():
+    nan = float("nan")
+    index = _hash_index("x", [nan, 1])
+    filters = [Filter.equal("x", nan), Filter.not_equal("x", nan), Filter.in_("x", [nan, 1]), Filter.not_in("x", [nan])]
+
+    for f in filters:
+        assert index.lookup([f]).consumed == ()
+    assert set(index.lookup([Filter.not_equal("x", 1)]).excluded) == {1}
+
+
+def _range_index(field, values):
+    index = RangeIndex(field)
+    for i, value in enumerate(values):
+        index.add(i, {field: value})
+    return index
+
+
+def test_range_index_answers_each_range_operator():
+    index = _range_index("age", [40, 35, None, 38, 50, 38])
+
+    def ids(f):
+        return set(index.lookup([f]).ids)
+
+    assert ids(Filter.greater_than("age", 38)) == {0, 4}
+    assert ids(Filter.greater_or_equal_than("age", 38)) == {0, 3, 4, 5}
+    assert ids(Filter.less_than("age", 38)) == {1}
+    assert ids(Filter.less_or_equal_than("age", 38)) == {1, 3, 5}
+    assert ids(Filter.equal("age", 38)) == {3, 5}
+
+
+def test_range_index_merges_filters_into_one_interval():
+    index = _range_index("created_at", ["2024-01-01", "2024-01-05", "2024-01-09", "2024-01-12"])
+
+    lookup = index.lookup(
+        [
+            Filter.greater_or_equal_than("created_at", "2024-01-01"),
+            Filter.greater_than("created_at", "2024-01-01"),
+            Filter.less_than("created_at", "2024-01-12"),
+            Filter.less_or_equal_than("created_at", "2024-01-30"),
+            Filter.like("created_at", "2024%"),
+        ]
+    )
+
+    assert set(lookup.ids) == {1, 2}
+    assert len(lookup.consumed) == 4
+
+
+def test_range_index_contradictory_interval_is_empty():
+    index = _range_index("age", [1, 2, 3])
+
+    assert set(index.lookup([Filter.greater_than("age", 2), Filter.less_than("age", 2)]).ids) == set()
+
+
+def test_range_index_does_not_answer_incomparable_values():
+    index = _range_index("age", [1, 2, 3])
+
+    assert index.lookup([Filter.greater_than("age", "a")]).ids is None
+    assert index.lookup([Filter.greater_than("age", None)]).ids is None
+
+
+def test_range_index_with_mixed_types_falls_back_to_scan():
+    index = _range_index("age", [1, "a"])
+
+    assert index.lookup([Filter.greater_than("age", 0)]).ids is None
+    assert index.ordered() is None
+
+
+def test_range_index_ordered_keeps_ties_in_insertion_order():
+    index = _range_index("age", [2, 1, None, 2, 1])
+
+    assert list(index.ordered()) == [2, 1, 4, 0, 3]
+    assert list(index.ordered(descending=True)) == [0, 3, 1, 4, 2]
+
+
+def test_range_index_keeps_nan_out_of_range_scans():
+    rng = random.Random(5)
+    values = [rng.choice([float("nan"), None, *range(5)]) for _ in range(50)]
+    index = _range_index("x", values)
+    bulk = RangeIndex("x")
+    bulk.add_all((i, {"x": value}) for i, value in enumerate(values))
+
+    for f in [Filter.greater_than("x", 1), Filter.less_or_equal_than("x", 3), Filter.equal("x", 2)]:
+        expected = {i for i, value in enumerate(values) if value is not None and compile_value_predicate(f)(value)}
+        assert set(index.lookup([f]).ids) == set(bulk.lookup([f]).ids) == expected
+    assert index.ordered() is None
+    assert len(bulk) == len(values)
+
+
+def test_range_index_add_all_sorts_once_and_keeps_insertion_order():
+    index = _range_index("age", [2, 1])
+    index.add_all([(2, {"age": None}), (3, {"age": 2}), (4, {"age": 1})])
+    mixed = RangeIndex("age")
+    mixed.add_all([(0, {"age": 1}), (1, {"age": "a"})])
+
+    assert list(index.ordered()) == [2, 1, 4, 0, 3]
+    assert mixed.ordered() is None
+    assert mixed.lookup([Filter.less_than("age", 5)]).ids is None
+
+
+def test_range_index_remove():
+    index = _range_index("age", [2, 1, None])
+
+    index.remove(0, {"age": 2})
+    index.remove(2, {"age": None})
+
+    assert list(index.ordered()) == [1]
+    assert len(index) == 1
+
+
+def test_trigram_index_candidates_contain_all_like_matches():
+    names = ["Vincent Vega", "Vega Suzuki", "Jules Winnfield", "Mia Wallace", "Marsellus Wallace", None, 42]
+    index = TrigramIndex("name")
+    for i, name in enumerate(names):
+        index.add(i, {"name": name})
+
+    assert set(index.lookup([Filter.like("name", "%Vega%")]).ids) == {0, 1}
+    assert set(index.lookup([Filter.like("name", "%Wall_ce")]).ids) == {3, 4}
+    assert set(index.lookup([Filter.like("name", "%lace%"), Filter.like("name", "Mia%")]).ids) == {3}
+    assert set(index.lookup([Filter.like("name", "%zzz%")]).ids) == set()
+
+
+def test_trigram_index_does_not_answer_short_or_negated_patterns():
+    index = TrigramIndex("name")
+    index.add(0, {"name": "Vincent"})
+
+    assert index.lookup([Filter.like("name", "%Vi%")]).ids is None
+    assert index.lookup([Filter.not_like("name", "%Vincent%")]).ids is None
+    assert index.lookup([Filter.like("name", "%Vincent%")]).consumed == ()
+
+
+def test_trigram_index_remove():
+    index = TrigramIndex("name")
+    index.add(0, {"name": "Vincent"})
+    index.add(1, {"name": "Vince"})
+
+    index.remove(0, {"name": "Vincent"})
+
+    assert set(index.lookup([Filter.like("name", "%Vinc%")]).ids) == {1}
+    assert len(index) == 3
+
+
+def test_inverted_index_intersects_contains_and_subtracts_not_contains():
+    tags = [["vip", "beta"], ["vip"], ("beta", "churned"), {"vip", "churned"}, [], None]
+    index = InvertedIndex("tags")
+    for i, value in enumerate(tags):
+        index.add(i, {"tags": value})
+
+    contains = index.lookup([Filter.contains("tags", "vip"), Filter.contains("tags", "beta")])
+    assert set(contains.ids) == {0}
+    assert len(contains.consumed) == 2
+
+    excluded = index.lookup([Filter.contains("tags", "vip"), Filter.not_contains("tags", "churned")])
+    assert set(excluded.ids) == {0, 1, 3}
+    assert set(excluded.excluded) == {2, 3}
+
+
+def test_inverted_index_rechecks_non_collection_values():
+    index = InvertedIndex("tags")
+    index.add(0, {"tags": ["vip"]})
+    index.add(1, {"tags": "vip,beta"})
+    index.add(2, {"tags": [["nested"]]})
+
+    lookup = index.lookup([Filter.contains("tags", "vip")])
+
+    assert set(lookup.ids) == {0, 1, 2}
+    assert lookup.consumed == ()
+    assert index.lookup([Filter.contains("tags", ["nested"])]).ids is None
+
+
+def test_inverted_index_remove():
+    index = InvertedIndex("tags")
+    index.add(0, {"tags": ["vip", "beta"]})
+    index.add(1, {"tags": ["beta"]})
+
+    index.remove(0, {"tags": ["vip", "beta"]})
+
+    assert set(index.ids("beta")) == {1}
+    assert len(index) == 1
+
+
+def test_bitmap_ids_lists_set_bits_in_order():
+    assert bitmap_ids(0) == []
+    assert bitmap_ids(0b1011) == [0, 1, 3]
+    assert bitmap_ids(1 << 1000 | 1 << 8) == [8, 1000]
+
+
+def test_bitmap_index_filter_bitmaps():
+    statuses = ["active", "banned", "active", None, "pending", "active"]
+    index = BitmapIndex("status")
+    for i, status in enumerate(statuses):
+        index.add(i, {"status": status})
+
+    assert bitmap_ids(index.bitmap(Filter.equal("status", "active"))) == [0, 2, 5]
+    assert bitmap_ids(index.bitmap(Filter.in_("status", ["banned", "pending", "unknown"]))) == [1, 4]
+    assert bitmap_ids(index.bitmap(Filter.not_equal("status", "active"))) == [1, 3, 4]
+    assert bitmap_ids(index.bitmap(Filter.not_in("status", ["active", None]))) == [1, 4]
+    assert index.bitmap(Filter.greater_than("status", "a")) is None
+
+    lookup = index.lookup([Filter.not_equal("status", "banned"), Filter.in_("status", ["active", "pending"])])
+    assert set(lookup.ids) == {0, 2, 4, 5}
+    assert len(lookup.consumed) == 2
+
+
+def test_bitmap_index_remove_and_unhashable_values():
+    index = BitmapIndex("status")
+    index.add(0, {"status": "active"})
+    index.add(1, {"status": "active"})
+    assert bitmap_ids(index.bitmap(Filter.equal("status", "active"))) == [0, 1]
+
+    index.remove(0, {"status": "active"})
+    assert bitmap_ids(index.bitmap(Filter.equal("status", "active"))) == [1]
+    assert bitmap_ids(index.bitmap(Filter.not_equal("status", "active"))) == []
+
+    index.remove(1, {"status": "active"})
+    assert len(index) == 0
+
+    index.add(2, {"status": ["active"]})
+    assert index.bitmap(Filter.equal("status", "active")) is None
+
+
+def test_bitmap_index_has_no_bitmap_for_nan_filters():
+    nan = float("nan")
+    index = BitmapIndex("x")
+    index.add(0, {"x": nan})
+    index.add(1, {"x": 1})
+
+    for f in [Filter.equal("x", nan), Filter.not_equal("x", nan), Filter.in_("x", [1, nan]), Filter.not_in("x", [nan])]:
+        assert index.bitmap(f) is None
+        assert index.lookup([f]).consumed == ()
+    assert bitmap_ids(index.bitmap(Filter.not_equal("x", 1))) == [0]
@@ -0,0 +1,256 @@
+import heapq
+import random
+
+import pytest
+
+from complexheart.domain.criteria import Criteria, Cursor, Order
+from complexheart.infrastructure.indexes import BitmapIndex, HashIndex, InvertedIndex, RangeIndex, TrigramIndex
+from complexheart.infrastructure.memory import InMemoryRepository
+
+CUSTOMERS = [
+    {"name": "Vincent", "age": 40, "status": "active", "tenant_id": 1},
+    {"name": "Jules", "age": 35, "status": "active", "tenant_id": 2},
+    {"name": "Mia", "age": 28, "status": "blocked", "tenant_id": 1},
+    {"name": "Butch", "age": 38, "status": "active", "tenant_id": 1},
+    {"name": "Marsellus", "age": 50, "status": "blocked", "tenant_id": 2},
+]
+
+
+def _names(records):
+    return [r["name"] for r in records]
+
+
+def _repository(*indexes):
+    return InMemoryRepository(CUSTOMERS, indexes)
+
+
+def test_memory_repository_matches_criteria():
+    c = Criteria().filter("status", "==", "active").filter("age", ">", 36)
+
+    assert _names(_repository().match(c)) == ["Vincent", "Butch"]
+
+
+def test_memory_repository_ors_groups():
+    c = Criteria().filter("status", "==", "blocked", group=0).filter("name", "==", "Jules", group=1)
+
+    assert _names(_repository(HashIndex("status")).match(c)) == ["Jules", "Mia", "Marsellus"]
+
+
+def test_memory_repository_applies_order_and_page():
+    c = Criteria().with_order(Order.desc(("age",))).with_page_limit(2).with_page_offset(1)
+
+    assert _names(_repository().match(c)) == ["Vincent", "Butch"]
+
+
+def test_memory_repository_without_filters_returns_first_page():
+    assert len(InMemoryRepository({"i": i} for i in range(30)).match(Criteria())) == 25
+
+
+def test_memory_repository_uses_hash_index_candidates():
+    repository = _repository(HashIndex("tenant_id"), HashIndex("status"))
+
+    c = Criteria().filter("tenant_id", "==", 1).filter("status", "in", ["active"]).filter("age", "<", 40)
+
+    assert _names(repository.match(c)) == ["Butch"]
+
+
+def test_memory_repository_hash_index_excludes_not_equal():
+    repository = _repository(HashIndex("status"), HashIndex("tenant_id"))
+
+    c = Criteria().filter("tenant_id", "==", 1).filter("status", "!=", "blocked")
+    c2 = Criteria().filter("tenant_id", "in", [1, 2]).filter("status", "not in", ["active"])
+
+    assert _names(repository.match(c)) == ["Vincent", "Butch"]
+    assert _names(repository.match(c2)) == ["Mia", "Marsellus"]
+
+
+def test_memory_repository_keeps_indexes_in_sync():
+    repository = _repository(HashIndex("status"))
+    c = Criteria().filter("status", "==", "blocked")
+
+    repository.update(0, {**CUSTOMERS[0], "status": "blocked"})
+    repository.remove(2)
+    new_id = repository.add({"name": "Honey", "age": 30, "status": "blocked", "tenant_id": 3})
+
+    assert new_id == 5
+    assert _names(repository.match(c)) == ["Vincent", "Marsellus", "Honey"]
+    assert 2 not in repository
+    assert len(repository) == 5
+
+
+def test_memory_repository_add_index_indexes_existing_records():
+    repository = _repository()
+    repository.add_index(HashIndex("status"))
+
+    assert _names(repository.match(Criteria().filter("status", "==", "blocked"))) == ["Mia", "Marsellus"]
+
+
+def test_memory_repository_index_matches_full_scan():
+    rng = random.Random(7)
+    records = [
+        {"status": rng.choice(["a", "b", "c", None]), "tenant_id": rng.randint(1, 5), "n": rng.randint(0, 100)}
+        for _ in range(500)
+    ]
+    indexed = InMemoryRepository(records, (HashIndex("status"), HashIndex("tenant_id")))
+    plain = InMemoryRepository(records)
+    criteria = [
+        Criteria().filter("status", "==", "a").filter("n", ">", 50),
+        Criteria().filter("status", "in", ["a", "b"]).filter("tenant_id", "!=", 3),
+        Criteria().filter("status", "==", None).filter("tenant_id", "in", [1, 2], group=1),
+        Criteria().filter("tenant_id", "not in", [1, 2]).filter("status", "!=", "c"),
+    ]
+
+    for c in criteria:
+        c = c.limit(1000)
+        assert indexed.match_ids(c) == plain.match_ids(c)
+
+
+def test_memory_repository_get_unknown_record_raises_key_error():
+    with pytest.raises(KeyError):
+        _repository().get(99)
+
+
+def test_memory_repository_range_index_serves_time_window_and_order():
+    events = [{"id": i, "created_at": f"2024-01-{(i * 7) % 28 + 1:02d}"} for i in range(100)]
+    indexed = InMemoryRepository(events, (RangeIndex("created_at"),))
+    plain = InMemoryRepository(events)
+
+    for c in [
+        Criteria().filter("created_at", ">=", "2024-01-05").filter("created_at", "<", "2024-01-10"),
+        Criteria().filter("created_at", ">=", "2024-01-05").order_by(("created_at",), "DESC").limit(10),
+        Criteria().order_by(("created_at",)).limit(5).offset(3),
+        Criteria().filter("id", ">", 90).order_by(("created_at",)),
+    ]:
+        assert indexed.match(c) == plain.match(c)
+
+
+def test_memory_repository_bulk_loads_range_indexes(mocker):
+    records = [{"n": (i * 37) % 100, "i": i} for i in range(100)]
+    add = mocker.spy(RangeIndex, "add")
+    repository = InMemoryRepository(records, (RangeIndex("n"),))
+    repository.add_index(RangeIndex("i"))
+    repository.add({"n": 5, "i": 100})
+    c = Criteria().filter("n", ">=", 5).filter("n", "<", 8).order_by(("n",), "DESC")
+
+    assert add.call_count == 2
+    assert repository.match(c) == InMemoryRepository([*records, {"n": 5, "i": 100}]).match(c)
+
+
+def test_memory_repository_orders_by_index_without_sorting(mocker):
+    repository = InMemoryRepository(({"n": n} for n in range(1000)), (RangeIndex("n"),))
+    top = mocker.patch("complexheart.infrastructure.memory.top")
+
+    result = repository.match(Criteria().order_by(("n",), "DESC").limit(3))
+
+    assert [r["n"] for r in result] == [999, 998, 997]
+    top.assert_not_called()
+
+
+def test_memory_repository_cursor_pages_walk_the_whole_result():
+    records = [{"id": i, "score": i % 7} for i in range(50)]
+    repository = InMemoryRepository(records, (RangeIndex("score"),))
+    c = Criteria().filter("id", ">", 3).order_by(("score", "id"), "DESC").with_cursor(Cursor.first(6))
+    expected = InMemoryRepository(records).match(c.with_page_limit(100).seek())
+
+    seen = []
+    while True:
+        page = repository.match(c)
+        seen.extend(page)
+        if len(page) < 6:
+            break
+        c = c.with_cursor(c.cursor_after(page[-1]))
+
+    assert seen == expected
+    assert len(seen) == 46
+
+
+@pytest.mark.parametrize("direction", ["ASC", "DESC"])
+def test_memory_repository_cursor_pages_walk_results_with_null_order_values(direction):
+    records = [{"id": i, "v": None if i % 3 == 0 else i % 4} for i in range(10)]
+    repository = InMemoryRepository(records, (RangeIndex("v"),))
+    c = Criteria().order_by(("v", "id"), direction).with_cursor(Cursor.first(3))
+    expected = InMemoryRepository(records).match(c.with_page_limit(100).seek())
+
+    seen = []
+    while True:
+        page = repository.match(c)
+        seen.extend(page)
+        if len(page) < 3:
+            break
+        c = c.with_cursor(c.cursor_after(page[-1]))
+
+    assert seen == expected
+    assert len(seen) == 10
+
+
+@pytest.mark.parametrize("operator", [">=", "<=", "=="])
+def test_memory_repository_range_index_matches_nothing_for_nan_filters(operator):
+    records = [{"x": float(i)} for i in range(50)]
+    c = Criteria().filter("x", operator, float("nan"))
+
+    assert InMemoryRepository(records, (RangeIndex("x"),)).match(c) == InMemoryRepository(records).match(c) == []
+
+
+def test_memory_repository_selects_top_k_with_heap(mocker):
+    repository = InMemoryRepository({"n": (i * 37) % 1000, "i": i} for i in range(1000))
+    nsmallest = mocker.spy(heapq, "nsmallest")
+
+    result = repository.match(Criteria().filter("i", ">=", 0).order_by(("n", "i")).limit(3).offset(2))
+
+    assert [r["n"] for r in result] == [2, 3, 4]
+    assert nsmallest.call_args.args[0] == 5
+
+
+def test_memory_repository_trigram_index_matches_full_scan():
+    rng = random.Random(11)
+    alphabet = "abcdef"
+    records = [{"name": "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))} for _ in range(2000)]
+    indexed = InMemoryRepository(records, (TrigramIndex("name"),))
+    plain = InMemoryRepository(records)
+
+    for pattern in ["%abc%", "%fed%cab%", "abc%", "%a_cd%", "%ab%", "%bad"]:
+        c = Criteria().filter("name", "like", pattern).limit(2000)
+        assert indexed.match_ids(c) == plain.match_ids(c), pattern
+
+
+def test_memory_repository_inverted_index_matches_full_scan():
+    rng = random.Random(13)
+    labels = ["vip", "beta", "churned", "trial", "staff"]
+    records = [{"tags": rng.sample(labels, rng.randint(0, 3))} for _ in range(1000)]
+    records += [{"tags": None}, {"tags": "vip"}, {}]
+    indexed = InMemoryRepository(records, (InvertedIndex("tags"),))
+    plain = InMemoryRepository(records)
+
+    for criteria in [
+        Criteria().filter("tags", "contains", "vip"),
+        Criteria().filter("tags", "contains", "vip").filter("tags", "contains", "beta"),
+        Criteria().filter("tags", "contains", "trial").filter("tags", "not contains", "staff"),
+        Criteria().filter("tags", "not contains", "vip") | Criteria().filter("tags", "contains", "staff"),
+    ]:
+        c = criteria.limit(2000)
+        assert indexed.match_ids(c) == plain.match_ids(c)
+
+
+def test_memory_repository_bitmap_indexes_match_full_scan(mocker):
+    rng = random.Random(14)
+    records = [
+        {"status": rng.choice(["active", "banned", "pending", None]), "country": rng.choice(["ES", "FR", "DE"])}
+        for _ in range(1500)
+    ]
+    indexed = InMemoryRepository(records, (BitmapIndex("status"), BitmapIndex("country")))
+    plain = InMemoryRepository(records)
+    group_ids = mocker.spy(indexed, "_group_ids")
+
+    criteria = [
+        Criteria().filter("status", "==", "active").filter("country", "in", ["ES", "FR"]),
+        Criteria().filter("status", "!=", "banned") | Criteria().filter("country", "not in", ["ES"]),
+        Criteria().filter("status", "in", ["pending", None]).filter("country", "!=", "DE")
+        | Criteria().filter("status", "==", "banned"),
+    ]
+    for c in criteria:
+        assert indexed.match_ids(c) == plain.match_ids(c)
+    assert group_ids.call_count == 0
+
+    mixed = Criteria().filter("status", "==", "active").filter("country", "like", "E%")
+    assert indexed.match_ids(mixed) == plain.match_ids(mixed)
+    assert group_ids.call_count == 1
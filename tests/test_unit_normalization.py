@@ -0,0 +1,165 @@
+import random
+
+from complexheart.domain.criteria import Criteria, Filter, FilterGroup, Operator, Order, Page
+from complexheart.domain.normalization import Interval, implies, normalize_group
+
+
+def _group(*filters):
+    return FilterGroup(tuple(filters))
+
+
+def test_normalize_drops_duplicate_filters():
+    group = _group(Filter.equal("a", 1), Filter.like("b", "x%"), Filter.equal("a", 1), Filter.like("b", "x%"))
+
+    assert normalize_group(group) == _group(Filter.equal("a", 1), Filter.like("b", "x%"))
+
+
+def test_normalize_intersects_in_filters():
+    group = _group(Filter.in_("a", [1, 2, 3]), Filter.in_("a", [3, 2, 9]))
+
+    assert normalize_group(group) == _group(Filter.in_("a", (2, 3)))
+
+
+def test_normalize_reduces_single_value_in_to_equal():
+    group = _group(Filter.in_("a", [1, 2]), Filter.in_("a", [2, 4]))
+
+    assert normalize_group(group) == _group(Filter.equal("a", 2))
+
+
+def test_normalize_tightens_ranges_into_one_interval():
+    group = _group(
+        Filter.greater_than("age", 18),
+        Filter.greater_or_equal_than("age", 21),
+        Filter.less_than("age", 65),
+        Filter.less_or_equal_than("age", 65),
+    )
+
+    assert normalize_group(group) == _group(Filter.greater_or_equal_than("age", 21), Filter.less_than("age", 65))
+
+
+def test_normalize_collapses_closed_point_interval_to_equal():
+    group = _group(Filter.greater_or_equal_than("a", 3), Filter.less_or_equal_than("a", 3))
+
+    assert normalize_group(group) == _group(Filter.equal("a", 3))
+
+
+def test_normalize_folds_ranges_and_exclusions_into_equalities():
+    group = _group(Filter.in_("a", [1, 5, 9]), Filter.greater_than("a", 2), Filter.not_equal("a", 9))
+
+    assert normalize_group(group) == _group(Filter.equal("a", 5))
+
+
+def test_normalize_drops_exclusions_outside_the_interval():
+    group = _group(Filter.greater_than("a", 10), Filter.not_equal("a", 3), Filter.not_in("a", [4, 11]))
+
+    assert normalize_group(group) == _group(Filter.greater_than("a", 10), Filter.not_equal("a", 11))
+
+
+def test_normalize_detects_contradictions():
+    assert normalize_group(_group(Filter.equal("x", 1), Filter.equal("x", 2))) is None
+    assert normalize_group(_group(Filter.equal("x", 1), Filter.not_equal("x", 1))) is None
+    assert normalize_group(_group(Filter.in_("x", [1, 2]), Filter.not_in("x", [1, 2]))) is None
+    assert normalize_group(_group(Filter.greater_than("x", 5), Filter.less_than("x", 5))) is None
+    assert normalize_group(_group(Filter.equal("x", 1), Filter.greater_than("x", 1))) is None
+
+
+def test_normalize_leaves_incomparable_filters_untouched():
+    group = _group(Filter.greater_than("a", 1), Filter.less_than("a", "z"))
+
+    assert normalize_group(group) == group
+
+
+def test_criteria_normalize_keeps_groups_with_incomparable_ranges():
+    mixed = Criteria().filter("x", "<", 2).filter("x", "<=", "a")
+    c = mixed | Criteria().filter("x", "!=", 2.5)
+
+    assert c.normalize() == c
+    assert not implies(mixed.groups[0], Criteria().filter("x", "!=", 2.5).groups[0])
+
+
+def test_criteria_normalize_removes_empty_and_duplicate_groups():
+    c = (
+        Criteria()
+        .filter("x", "==", 1, group=0)
+        .filter("x", "==", 2, group=0)
+        .filter("y", "==", 1, group=1)
+        .filter("y", "==", 1, group=2)
+        .order_by(("y",))
+        .limit(5)
+    )
+
+    result = c.normalize()
+
+    assert result.groups == (_group(Filter.equal("y", 1)),)
+    assert result.order == Order.asc(("y",))
+    assert result.page == Page(5, 0)
+
+
+def test_criteria_normalize_drops_subsumed_groups():
+    c = (
+        Criteria()
+        .filter("status", "==", "active", group=0)
+        .filter("age", ">=", 30, group=0)
+        .filter("status", "in", ["active", "pending"], group=1)
+        .filter("role", "==", "admin", group=2)
+    )
+
+    assert c.normalize().groups == (
+        _group(Filter.in_("status", ("active", "pending"))),
+        _group(Filter.equal("role", "admin")),
+    )
+
+
+def test_criteria_normalize_contradiction_matches_nothing():
+    c = Criteria().filter("x", "==", 1).filter("x", "==", 2)
+
+    result = c.normalize()
+
+    assert result.has_filters()
+    assert not result.compile()({"x": 1})
+    assert not result.compile()({"x": 2})
+
+
+def test_criteria_normalize_without_filters():
+    assert Criteria().normalize() == Criteria()
+
+
+def test_implies_checks_equalities_sets_and_ranges():
+    narrow = _group(Filter.equal("status", "active"), Filter.greater_or_equal_than("age", 30))
+
+    assert implies(narrow, _group(Filter.equal("status", "active")))
+    assert implies(narrow, _group(Filter.in_("status", ["active", "x"]), Filter.greater_than("age", 20)))
+    assert implies(narrow, _group(Filter.not_equal("status", "blocked"), Filter.not_in("age", [10, 20])))
+    assert not implies(narrow, _group(Filter.greater_than("age", 30)))
+    assert not implies(narrow, _group(Filter.equal("role", "admin")))
+    assert not implies(_group(Filter.greater_than("age", 1)), narrow)
+
+
+def test_interval_within():
+    inner = Interval().tighten(Filter.greater_than("a", 1)).tighten(Filter.less_than("a", 5))
+    outer = Interval().tighten(Filter.greater_or_equal_than("a", 1))
+
+    assert inner.within(outer)
+    assert not outer.within(inner)
+
+
+def test_normalize_preserves_matches():
+    rng = random.Random(3)
+    fields = ("a", "b")
+    operators = [Operator.EQUAL, Operator.NOT_EQUAL, Operator.GT, Operator.GTE, Operator.LT, Operator.LTE]
+
+    def random_filter():
+        field = rng.choice(fields)
+        if rng.random() < 0.2:
+            return Filter(field, rng.choice([Operator.IN, Operator.NOT_IN]), rng.sample(range(6), rng.randint(0, 3)))
+        return Filter(field, rng.choice(operators), rng.randint(0, 5))
+
+    records = [{"a": a, "b": b} for a in [*range(6), None] for b in range(6)]
+    for _ in range(300):
+        c = Criteria()
+        for group in range(rng.randint(1, 3)):
+            for _ in range(rng.randint(1, 4)):
+                f = random_filter()
+                c = c.filter(f.field, str(f.operator), f.value, group)
+        original, normalized = c.compile(), c.normalize().compile()
+        assert [original(r) for r in records] == [normalized(r) for r in records], repr(c.groups)
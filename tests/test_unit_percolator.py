@@ -0,0 +1,108 @@
+import random
+
+from complexheart.domain.criteria import Criteria, FilterGroup
+from complexheart.infrastructure.percolator import Anchor, Percolator, RangeRules, anchor
+
+
+def test_anchor_prefers_equal_then_in_then_range():
+    c = Criteria().filter("age", ">", 18).filter("country", "in", ["ES", "FR"]).filter("status", "==", "active")
+
+    assert anchor(c.groups[0]) == Anchor("status", ("active",))
+    assert anchor(Criteria().filter("age", ">", 18).filter("country", "in", ["ES"]).groups[0]) == Anchor(
+        "country", ("ES",)
+    )
+    assert anchor(Criteria().filter("age", ">", 18).filter("age", "<=", 65).groups[0]).interval is not None
+    assert anchor(Criteria().filter("name", "like", "%a%").groups[0]) is None
+    assert anchor(Criteria().filter("tags", "==", ["a"]).groups[0]) is None
+
+
+def test_percolator_returns_matching_rules_in_registration_order():
+    percolator = Percolator()
+    percolator.add("vip-es", Criteria().filter("country", "==", "ES").filter("tier", "==", "vip"))
+    percolator.add("adults", Criteria().filter("age", ">=", 18))
+    percolator.add("minors", Criteria().filter("age", "<", 18))
+    percolator.add("latam", Criteria().filter("country", "in", ["MX", "AR"]) | Criteria().filter("lang", "==", "es"))
+    percolator.add("gmail", Criteria().filter("email", "like", "%@gmail.com"))
+    percolator.add("everything", Criteria())
+
+    record = {"country": "ES", "tier": "vip", "age": 30, "lang": "es", "email": "mia@gmail.com"}
+
+    assert percolator.match(record) == ["vip-es", "adults", "latam", "gmail", "everything"]
+    assert percolator.match({"age": 12, "country": "AR"}) == ["minors", "latam", "everything"]
+    assert percolator.match({"age": "unknown", "country": ["ES"]}) == ["everything"]
+
+
+def test_percolator_remove_and_replace_rules():
+    percolator = Percolator()
+    percolator.add("a", Criteria().filter("x", "==", 1))
+    percolator.add("b", Criteria().filter("x", ">", 0))
+    percolator.add("a", Criteria().filter("x", "==", 2))
+
+    assert percolator.match({"x": 1}) == ["b"]
+
+    percolator.remove("b")
+
+    assert percolator.match({"x": 2}) == ["a"]
+    assert "b" not in percolator
+    assert len(percolator) == 1
+
+
+def test_percolator_matches_linear_scan():
+    rng = random.Random(22)
+    fields = ["a", "b", "c"]
+    rules = {}
+    for i in range(400):
+        groups = []
+        for _ in range(rng.randint(0, 2)):
+            group = FilterGroup()
+            for _ in range(rng.randint(1, 3)):
+                field = rng.choice(fields)
+                op = rng.choice(["==", "in", ">", ">=", "<", "<=", "!="])
+                value = [rng.randint(0, 9) for _ in range(3)] if op == "in" else rng.randint(0, 9)
+                group = group.add_filter(Criteria().filter(field, op, value).filters[0])
+            groups.append(group)
+        rules[i] = Criteria(tuple(groups))
+    percolator = Percolator()
+    for rule, criteria in rules.items():
+        percolator.add(rule, criteria)
+
+    for _ in range(300):
+        record = {f: rng.choice([None, *range(10)]) for f in fields if rng.random() < 0.9}
+        expected = [rule for rule, criteria in rules.items() if criteria.compile()(record)]
+        assert percolator.match(record) == expected
+
+
+def test_range_rules_narrow_window_candidates_by_both_bounds():
+    rng = random.Random(5)
+    rules = {}
+    percolator = Percolator()
+    for i in range(2000):
+        low = rng.random()
+        rules[i] = Criteria().filter("x", ">=", low).filter("x", "<", low + rng.choice([0.001, 0.01, 2]))
+        if i % 10 == 0:
+            rules[i] = Criteria().filter("x", "<=", low)
+        percolator.add(i, rules[i])
+    for i in range(0, 2000, 7):
+        percolator.remove(i)
+        del rules[i]
+
+    for _ in range(100):
+        record = {"x": rng.random()}
+        expected = [rule for rule, criteria in rules.items() if criteria.compile()(record)]
+        assert percolator.match(record) == expected
+
+    ranges = RangeRules()
+    for key in range(1000):
+        ranges.add(key, anchor(Criteria().filter("x", ">=", key).filter("x", "<", key + 1).groups[0]).interval)
+
+    assert list(ranges.candidates(500.5)) == [500]
+    assert list(ranges.candidates(-1)) == []
+
+
+def test_range_rules_scan_upper_bounds_when_lower_bounds_are_incomparable():
+    percolator = Percolator()
+    percolator.add("ints", Criteria().filter("x", ">=", 5))
+    percolator.add("strs", Criteria().filter("x", "<", "m"))
+
+    assert percolator.match({"x": "a"}) == ["strs"]
+    assert percolator.match({"x": 7}) == ["ints"]
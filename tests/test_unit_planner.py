@@ -0,0 +1,102 @@
+import pytest
+
+from complexheart.domain.criteria import Criteria, Filter, FilterGroup
+from complexheart.infrastructure.planner import Planner
+from complexheart.infrastructure.statistics import Statistics
+
+RECORDS = [
+    {"status": "vip" if i % 100 == 0 else "regular", "name": f"customer-{i}", "age": i % 80, "tags": ["a"]}
+    for i in range(2000)
+]
+
+
+def _statistics():
+    statistics = Statistics(seed=1)
+    statistics.collect(RECORDS, ("status", "name", "age"))
+    return statistics
+
+
+def test_statistics_collects_counts_and_cardinality():
+    stats = _statistics().field("status")
+
+    assert stats.count == 2000
+    assert stats.nulls == 0
+    assert stats.cardinality == 2
+    assert stats.frequencies["vip"] == 20
+    assert not stats.saturated
+
+
+def test_statistics_saturates_high_cardinality_fields():
+    stats = _statistics().field("name")
+
+    assert stats.saturated
+    assert len(stats.sample) == 256
+
+
+def test_statistics_histogram():
+    histogram = _statistics().field("age").histogram(4)
+
+    assert len(histogram) == 4
+    assert sum(count for _, _, count in histogram) == 256
+    assert histogram[0][0] == 0
+
+
+def test_statistics_selectivity_estimates():
+    statistics = _statistics()
+
+    assert statistics.selectivity(Filter.equal("status", "vip")) == pytest.approx(0.01)
+    assert statistics.selectivity(Filter.not_equal("status", "vip")) == pytest.approx(0.99)
+    assert statistics.selectivity(Filter.less_than("age", 40)) == pytest.approx(0.5, abs=0.1)
+    assert statistics.selectivity(Filter.like("name", "customer-%")) == 1.0
+    assert statistics.selectivity(Filter.equal("unknown", 1)) == 0.1
+
+
+def test_statistics_prefers_observed_hit_rates():
+    statistics = _statistics()
+    c = Criteria().filter("tags", "contains", "a")
+
+    statistics.observe_records(c, RECORDS[:150])
+
+    assert statistics.hit_rate(Filter.contains("tags", "a")).evaluated == 150
+    assert statistics.selectivity(Filter.contains("tags", "a")) == 1.0
+    assert statistics.selectivity(Filter.contains("tags", "b")) == 1.0
+
+
+def test_planner_puts_selective_cheap_filters_first():
+    planner = Planner(_statistics())
+    group = FilterGroup.create(Filter.like("name", "%7"), Filter.less_than("age", 70), Filter.equal("status", "vip"))
+
+    assert planner.plan_group(group) == FilterGroup.create(
+        Filter.equal("status", "vip"), Filter.like("name", "%7"), Filter.less_than("age", 70)
+    )
+
+
+def test_planner_tries_likeliest_group_first():
+    planner = Planner(_statistics())
+    c = (
+        Criteria()
+        .filter("status", "==", "vip", group=0)
+        .filter("status", "==", "regular", group=1)
+        .order_by(("age",))
+        .limit(5)
+    )
+
+    planned = planner.plan(c)
+
+    assert planned.groups[0] == FilterGroup.create(Filter.equal("status", "regular"))
+    assert planned.order == c.order
+    assert planned.page == c.page
+
+
+def test_planner_preserves_matches():
+    planner = Planner(_statistics())
+    c = (
+        Criteria()
+        .filter("name", "like", "%7", group=0)
+        .filter("status", "==", "regular", group=0)
+        .filter("age", ">=", 79, group=1)
+    )
+
+    original, planned = c.compile(), planner.plan(c).compile()
+
+    assert [original(r) for r in RECORDS] == [planned(r) for r in RECORDS]
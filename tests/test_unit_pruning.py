@@ -0,0 +1,86 @@
+import random
+from datetime import date, timedelta
+
+from complexheart.domain.criteria import Criteria
+from complexheart.infrastructure.pruning import FieldZone, ZoneMap, prune
+
+
+def _daily_partitions():
+    start = date(2024, 1, 1)
+    return [
+        [
+            {"created_at": start + timedelta(days=day), "status": "active" if day % 2 else "closed", "n": h}
+            for h in range(24)
+        ]
+        for day in range(10)
+    ]
+
+
+def test_prune_skips_chunks_outside_range_filters():
+    zones = [ZoneMap.from_records(chunk, ("created_at", "status", "n")) for chunk in _daily_partitions()]
+
+    assert prune(Criteria().filter("created_at", ">=", date(2024, 1, 8)), zones) == [7, 8, 9]
+    assert prune(Criteria().filter("created_at", "<", date(2024, 1, 2)), zones) == [0]
+    assert prune(Criteria().filter("created_at", "==", date(2024, 1, 5)), zones) == [4]
+    assert prune(Criteria().filter("created_at", "in", [date(2024, 1, 1), date(2024, 1, 3)]), zones) == [0, 2]
+    assert prune(Criteria().filter("status", "==", "active").filter("created_at", "<=", date(2024, 1, 4)), zones) == [
+        1,
+        3,
+    ]
+    assert prune(Criteria().filter("n", ">", 30) | Criteria().filter("created_at", "==", date(2024, 1, 10)), zones) == [
+        9
+    ]
+    assert prune(Criteria().filter("status", "!=", "closed"), zones) == [1, 3, 5, 7, 9]
+    assert prune(Criteria().filter("unknown", "==", 1), zones) == list(range(10))
+
+
+def test_field_zone_handles_nulls_mixed_types_and_like():
+    nulls = FieldZone.from_values([None, None])
+    mixed = FieldZone.from_values([1, "a", 2.5], max_distinct=2)
+    names = FieldZone.from_values([f"user-{i:03}" for i in range(100)])
+
+    assert nulls.may_match(Criteria().filter("x", "==", None).filters[0])
+    assert not nulls.may_match(Criteria().filter("x", ">", 0).filters[0])
+    assert not nulls.may_match(Criteria().filter("x", "!=", None).filters[0])
+    assert mixed.may_match(Criteria().filter("x", ">", 100).filters[0])
+    assert names.values is None
+    assert names.may_match(Criteria().filter("x", "like", "user-05%").filters[0])
+    assert not names.may_match(Criteria().filter("x", "like", "admin-%").filters[0])
+    assert not names.may_match(Criteria().filter("x", "like", "zz%").filters[0])
+    assert FieldZone.from_values(["5"]).may_match(Criteria().filter("x", "like", 5).filters[0])
+
+
+def test_field_zone_ignores_nan_in_ranges():
+    nan = float("nan")
+    zones = [ZoneMap.from_columns({"x": [nan, 5.0]}), ZoneMap.from_columns({"x": [nan] * 100})]
+
+    assert zones[0].fields["x"].minimum == zones[0].fields["x"].maximum == 5.0
+    assert prune(Criteria().filter("x", ">", 1), zones) == [0, 1]
+    assert prune(Criteria().filter("x", "<", 1), zones) == [1]
+    assert prune(Criteria().filter("x", "!=", None), zones) == [0, 1]
+    assert prune(Criteria().filter("x", "!=", nan), zones) == [0, 1]
+    assert prune(Criteria().filter("x", "not in", [nan, 5.0]), zones) == [0, 1]
+
+
+def test_prune_never_drops_a_matching_chunk():
+    rng = random.Random(24)
+    for _ in range(200):
+        chunks = [
+            [
+                {"a": rng.choice([None, float("nan"), *range(6)]), "b": rng.choice(["x", "y", "z", "5", None])}
+                for _ in range(rng.randint(0, 5))
+            ]
+            for _ in range(8)
+        ]
+        zones = [ZoneMap.from_records(chunk, ("a", "b"), max_distinct=rng.choice([1, 3, 64])) for chunk in chunks]
+        c = Criteria()
+        for group in range(rng.randint(1, 2)):
+            for _ in range(rng.randint(1, 2)):
+                field = rng.choice(["a", "b"])
+                op = rng.choice(["==", "!=", ">", ">=", "<", "<=", "in", "not in", "like"])
+                value = rng.choice([None, *range(6), "x", "y"]) if op not in ("in", "not in") else [1, "x", None]
+                value = rng.choice(["x%", 5]) if op == "like" else value
+                c = c.filter(field, op, value, group=group)
+        matches = c.compile()
+        expected = [i for i, chunk in enumerate(chunks) if any(matches(r) for r in chunk)]
+        assert set(expected) <= set(prune(c, zones))
@@ -0,0 +1,156 @@
+import sqlite3
+
+import pytest
+
+from complexheart.domain.criteria import Criteria, Cursor, Filter, FilterGroup, Order
+from complexheart.infrastructure.sql import SqlCompiler, arity_bucket, criteria_shape
+
+ROWS = [
+    ("Vincent", 40, "active"),
+    ("Jules", 35, "active"),
+    ("Mia", None, "blocked"),
+    ("Butch", 38, "active"),
+    ("Marsellus", 50, "blocked"),
+]
+
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE customers (name TEXT, age INTEGER, status TEXT)")
+    connection.executemany("INSERT INTO customers VALUES (?, ?, ?)", ROWS)
+    yield connection
+    connection.close()
+
+
+def _names(connection, criteria):
+    statement = SqlCompiler.sqlite("customers", ("name",)).compile(criteria)
+    return [row[0] for row in connection.execute(statement.sql, statement.params)]
+
+
+def test_sql_compiles_placeholders_and_params():
+    c = Criteria().filter("status", "==", "active").filter("age", ">", 18).order_by(("name",), "DESC").limit(10)
+
+    statement = SqlCompiler("customers").compile(c)
+
+    assert statement.sql == (
+        'SELECT * FROM "customers" WHERE ("status" = ? AND "age" > ?) ORDER BY "name" DESC LIMIT ? OFFSET ?'
+    )
+    assert statement.params == ("active", 18, 10, 0)
+
+
+def test_sql_ors_groups(connection):
+    c = Criteria().filter("status", "==", "blocked", group=0).filter("name", "==", "Jules", group=1)
+
+    assert sorted(_names(connection, c)) == ["Jules", "Marsellus", "Mia"]
+
+
+def test_sql_matches_in_memory_evaluation(connection):
+    records = [dict(zip(("name", "age", "status"), row, strict=True)) for row in ROWS]
+    criteria = [
+        Criteria().filter("age", ">=", 38),
+        Criteria().filter("age", "<", 38),
+        Criteria().filter("age", "<=", 38).filter("status", "!=", "blocked"),
+        Criteria().filter("name", "in", ["Mia", "Butch", "Jules"]),
+        Criteria().filter("name", "not in", ["Mia", "Butch", "Jules"]),
+        Criteria().filter("name", "like", "M%"),
+        Criteria().filter("name", "not like", "M%"),
+        Criteria().filter("name", "contains", "ul"),
+        Criteria().filter("name", "not contains", "ul"),
+    ]
+
+    for c in criteria:
+        matches = c.compile()
+        assert sorted(_names(connection, c)) == sorted(r["name"] for r in records if matches(r)), str(c)
+
+
+def test_sql_null_equality_uses_is_null(connection):
+    statement = SqlCompiler("customers").compile(Criteria().filter("age", "==", None))
+
+    assert '"age" IS NULL' in statement.sql
+    assert _names(connection, Criteria().filter("age", "==", None)) == ["Mia"]
+    assert "Mia" not in _names(connection, Criteria().filter("age", "!=", None))
+
+
+def test_sql_empty_in_list(connection):
+    assert _names(connection, Criteria().filter("name", "in", [])) == []
+    assert len(_names(connection, Criteria().filter("name", "not in", []))) == 5
+
+
+def test_sql_contains_escapes_wildcards(connection):
+    connection.execute("INSERT INTO customers VALUES ('100%', 1, 'active')")
+    connection.execute("INSERT INTO customers VALUES ('a_b!c', 1, 'active')")
+    statement = SqlCompiler("customers", paramstyle="format").compile(Criteria().filter("name", "contains", "x"))
+
+    assert _names(connection, Criteria().filter("name", "contains", "0%")) == ["100%"]
+    assert _names(connection, Criteria().filter("name", "contains", "_b!")) == ["a_b!c"]
+    assert statement.sql.endswith("\"name\" LIKE %s ESCAPE '!') LIMIT %s OFFSET %s")
+
+
+def test_sql_applies_order_and_page(connection):
+    c = Criteria().with_order(Order.desc(("age",))).with_page_limit(2).with_page_offset(1)
+
+    assert _names(connection, c) == ["Vincent", "Butch"]
+
+
+def test_sql_in_lists_are_padded_to_arity_bucket():
+    statement = SqlCompiler("t").compile(Criteria().filter("a", "in", [1, 2, 3]))
+
+    assert statement.sql.count("?") == 4 + 2
+    assert statement.params == (1, 2, 3, 3, 25, 0)
+    assert [arity_bucket(n) for n in range(6)] == [0, 1, 2, 4, 4, 8]
+
+
+def test_sql_cache_is_keyed_by_shape():
+    compiler = SqlCompiler("t")
+
+    first = compiler.compile(Criteria().filter("a", "==", 1).filter("b", "in", [1, 2, 3]).limit(5))
+    second = compiler.compile(Criteria().filter("a", "==", 2).filter("b", "in", [4, 5, 6, 7]).offset(9))
+    compiler.compile(Criteria().filter("a", "==", None))
+
+    assert first.sql is second.sql
+    assert compiler.cache_info().hits == 1
+    assert compiler.cache_info().misses == 2
+
+
+def test_sql_shape_ignores_values_and_empty_groups():
+    c1 = Criteria().with_filter_group(FilterGroup()).with_filter_group(FilterGroup.create(Filter.equal("a", 1)))
+    c2 = Criteria().filter("a", "==", 2)
+
+    assert criteria_shape(c1) == criteria_shape(c2)
+
+
+def test_sql_paramstyles():
+    c = Criteria().filter("a", "==", 1)
+
+    assert SqlCompiler("t", paramstyle="numeric").compile(c).sql.endswith('"a" = :1) LIMIT :2 OFFSET :3')
+    assert SqlCompiler("t", paramstyle="format").compile(c).sql.endswith('"a" = %s) LIMIT %s OFFSET %s')
+    named = SqlCompiler("t", paramstyle="named").compile(c)
+    assert named.sql.endswith('"a" = :p1) LIMIT :p2 OFFSET :p3')
+    assert named.params == {"p1": 1, "p2": 25, "p3": 0}
+    pyformat = SqlCompiler("t", paramstyle="pyformat").compile(c)
+    assert pyformat.sql.endswith('"a" = %(p1)s) LIMIT %(p2)s OFFSET %(p3)s')
+
+
+def test_sql_quotes_identifiers():
+    statement = SqlCompiler('my"table').compile(Criteria().filter("c.name", "==", 1))
+
+    assert statement.sql.startswith('SELECT * FROM "my""table" WHERE ("c"."name" = ?)')
+
+
+def test_sql_rejects_unknown_paramstyle():
+    with pytest.raises(ValueError):
+        SqlCompiler("t", paramstyle="dollar")
+
+
+def test_sql_cursor_compiles_seek_predicate(connection):
+    c = Criteria().filter("status", "==", "active").order_by(("age", "name")).with_cursor(Cursor(2, (38, "Butch")))
+
+    statement = SqlCompiler("customers").compile(c)
+
+    assert statement.sql == (
+        'SELECT * FROM "customers" WHERE ("status" = ? AND "age" > ?) OR '
+        '("status" = ? AND "age" = ? AND "name" > ?) ORDER BY "age" ASC, "name" ASC LIMIT ? OFFSET ?'
+    )
+    assert statement.params == ("active", 38, "active", 38, "Butch", 2, 0)
+    assert _names(connection, c) == ["Vincent"]
@@ -0,0 +1,82 @@
+from datetime import date
+
+import pytest
+
+from complexheart.domain import template as template_module
+from complexheart.domain.criteria import Criteria, Filter, Param
+from complexheart.infrastructure.sql import SqlCompiler
+
+EVENTS = [
+    {"tenant": 1, "kind": "login", "day": date(2024, 1, 2)},
+    {"tenant": 1, "kind": "logout", "day": date(2024, 1, 3)},
+    {"tenant": 2, "kind": "login", "day": date(2024, 1, 4)},
+    {"tenant": 1, "kind": "login", "day": date(2023, 12, 31)},
+]
+
+
+def _template():
+    return (
+        Criteria()
+        .filter("tenant", "==", Param("tenant"))
+        .filter("kind", "==", "login")
+        .filter("day", ">=", Param("since"))
+        .filter("kind", "in", Param("kinds"), group=1)
+        .order_by(("day",), "DESC")
+        .limit(10)
+        .template()
+    )
+
+
+def test_template_bind_builds_the_equivalent_criteria():
+    template = _template()
+
+    bound = template.bind(tenant=1, since=date(2024, 1, 1), kinds=["purchase"])
+
+    assert template.params == {"tenant", "since", "kinds"}
+    assert bound == (
+        Criteria()
+        .filter("tenant", "==", 1)
+        .filter("kind", "==", "login")
+        .filter("day", ">=", date(2024, 1, 1))
+        .filter("kind", "in", ["purchase"], group=1)
+        .order_by(("day",), "DESC")
+        .limit(10)
+    )
+
+
+def test_template_bind_precompiles_static_filters(mocker):
+    template = _template()
+    compile_filter = mocker.spy(template_module, "compile_filter")
+
+    bound = template.bind(tenant=1, since=date(2024, 1, 1), kinds=["logout"])
+    matches = bound.compile()
+
+    assert compile_filter.call_count == 3
+    assert [e for e in EVENTS if matches(e)] == EVENTS[:2]
+    assert bound.groups[0][1] is template.criteria.groups[0][1]
+
+
+def test_template_bind_validates_parameters():
+    template = _template()
+
+    with pytest.raises(ValueError, match="Missing template parameters: kinds"):
+        template.bind(tenant=1, since=date(2024, 1, 1))
+    with pytest.raises(ValueError, match="Unknown template parameters: other"):
+        template.bind(tenant=1, since=date(2024, 1, 1), kinds=[], other=2)
+
+
+def test_template_bound_criteria_reuse_cached_sql():
+    compiler = SqlCompiler.sqlite("events")
+    template = _template()
+
+    first = compiler.compile(template.bind(tenant=1, since=date(2024, 1, 1), kinds=["a", "b"]))
+    compiler.compile(template.bind(tenant=2, since=date(2024, 2, 1), kinds=["c"]))
+
+    assert compiler.compile(template.bind(tenant=3, since=date(2024, 3, 1), kinds=["d", "e"])).sql == first.sql
+    assert compiler.cache_info().hits == 1
+
+
+def test_param_requires_identifier_name():
+    assert str(Filter.equal("tenant", Param("tenant"))) == "tenant == :tenant"
+    with pytest.raises(ValueError):
+        Param("not valid")
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from complexheart.domain.criteria import Criteria, Cursor
+from complexheart.infrastructure import view as view_module
+from complexheart.infrastructure.memory import InMemoryRepository
+from complexheart.infrastructure.view import MaterializedView
+
+
+def test_view_keeps_ordered_page_and_reports_visible_changes():
+    view = MaterializedView(
+        Criteria().filter("status", "==", "active").order_by(("score",), "DESC").limit(2),
+        [(1, {"status": "active", "score": 10}), (2, {"status": "active", "score": 30})],
+    )
+
+    assert view.insert(3, {"status": "active", "score": 20}) is True
+    assert view.insert(4, {"status": "active", "score": 5}) is False
+    assert view.insert(5, {"status": "blocked", "score": 99}) is False
+    assert [r["score"] for r in view.rows] == [30, 20]
+
+    assert view.update(4, {"status": "active", "score": 50}) is True
+    assert [r["score"] for r in view.rows] == [50, 30]
+
+    assert view.delete(1) is False
+    assert view.delete(4) is True
+    assert [r["score"] for r in view.rows] == [30, 20]
+    assert len(view) == 2
+    assert 1 not in view
+
+
+@pytest.mark.parametrize("order", ["ASC", "DESC"])
+def test_view_initial_build_sorts_once_and_matches_incremental_inserts(mocker, order):
+    rng = random.Random(order)
+    records = [(rng.randint(0, 30), {"a": rng.randint(0, 9), "b": rng.randint(0, 4)}) for _ in range(60)]
+    criteria = Criteria().filter("a", ">", 2).order_by(("b",), order).limit(8).offset(2)
+    incremental = MaterializedView(criteria)
+    for record_id, record in records:
+        incremental.insert(record_id, record)
+    insort = mocker.spy(view_module, "insort")
+
+    view = MaterializedView(criteria, records)
+
+    insort.assert_not_called()
+    assert view.rows == incremental.rows
+    assert len(view) == len(incremental)
+    assert view.insert(99, {"a": 9, "b": 0}) == incremental.insert(99, {"a": 9, "b": 0})
+    assert view.rows == incremental.rows
+
+
+@pytest.mark.parametrize(
+    "criteria",
+    [
+        Criteria().filter("a", ">", 3).order_by(("b",), "ASC").limit(7).offset(3),
+        Criteria().filter("a", ">", 3).order_by(("b", "a"), "DESC").limit(5).offset(2),
+        Criteria().filter("a", "<", 5).filter("b", "!=", 2).limit(6).offset(1),
+        Criteria().filter("a", "in", [1, 2, 3, 4]).order_by(("b",), "DESC").with_cursor(Cursor(4, (3,))),
+    ],
+)
+def test_view_matches_repository_after_random_changes(criteria):
+    rng = random.Random(23)
+    repository = InMemoryRepository({"a": rng.randint(0, 9), "b": rng.randint(0, 4)} for _ in range(50))
+    view = repository.materialize(criteria)
+    live = list(range(50))
+
+    for _ in range(400):
+        action = rng.random()
+        if action < 0.4 or not live:
+            live.append(repository.add({"a": rng.randint(0, 9), "b": rng.randint(0, 4)}))
+        elif action < 0.8:
+            repository.update(rng.choice(live), {"a": rng.randint(0, 9), "b": rng.randint(0, 4)})
+        else:
+            repository.remove(live.pop(rng.randrange(len(live))))
+        assert view.rows == repository.match(criteria)
+
+
+def test_view_removes_the_right_entry_around_nan_order_keys():
+    nan = float("nan")
+    repository = InMemoryRepository([{"c": v} for v in (nan, nan, 0.0, 2.0)])
+    view = repository.materialize(Criteria().order_by(("c",)))
+
+    for record_id in (3, 1, 2):
+        repository.remove(record_id)
+
+    assert len(view) == 1
+    assert view.rows[0]["c"] != view.rows[0]["c"]
+
+
+def test_dropped_view_stops_receiving_changes():
+    repository = InMemoryRepository([{"a": 1}])
+    view = repository.materialize(Criteria().filter("a", ">", 0))
+
+    repository.drop_view(view)
+    repository.add({"a": 2})
+
+    assert view.rows == [{"a": 1}]